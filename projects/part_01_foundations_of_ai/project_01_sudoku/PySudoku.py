@@ -1,12 +1,52 @@
-import sys, os, random, pygame
+import sys, os, argparse, pygame
 sys.path.append(os.path.join("objects"))
 import SudokuSquare
 from utils import *
 from GameResources import *
 
 
-def play(values, result, history):
-    assignments = reconstruct(result, history)
+def square_position(x, y):
+    """Return the top left corner of the square of column x and row y on the board image"""
+    if x in (0, 1, 2):  startX = (x * 57) + 38
+    if x in (3, 4, 5):  startX = (x * 57) + 99
+    if x in (6, 7, 8):  startX = (x * 57) + 159
+
+    if y in (0, 1, 2):  startY = (y * 57) + 35
+    if y in (3, 4, 5):  startY = (y * 57) + 100
+    if y in (6, 7, 8):  startY = (y * 57) + 165
+    return startX, startY
+
+
+def box_number(value):
+    if len(value) > 1 or value == '' or value == '.':
+        return None
+    return int(value)
+
+
+def play(values, steps, frames=None, fps=5):
+    """Replay a solve on the board, one assignment per frame
+
+    Parameters
+    ----------
+    values(dict)
+        the starting puzzle in dictionary form
+
+    steps(iterable)
+        (box, value) assignments applied in order, consumed lazily: e.g. the
+        steps of `solution.solve_steps` as the solver makes them, or the
+        `history` recorded by an earlier solve
+
+    frames(string or None)
+        headless mode: render with the SDL dummy video driver and save every
+        frame as a PNG image in this directory instead of opening a window
+
+    fps(int)
+        frames per second of the windowed replay
+    """
+    if frames is not None:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        if not os.path.isdir(frames):
+            os.makedirs(frames)
     pygame.init()
 
     size = width, height = 700, 700
@@ -16,44 +56,66 @@ def play(values, result, history):
 
     clock = pygame.time.Clock()
 
+    # One sprite per box, created once and updated in place
+    squares = {}
+    for y in range(9):
+        for x in range(9):
+            startX, startY = square_position(x, y)
+            squares[rows[y] + cols[x]] = SudokuSquare.SudokuSquare(
+                box_number(values[rows[y] + cols[x]]), startX, startY, "N", x, y)
+
+    screen.blit(background_image, (0, 0))
+    for square in squares.values():
+        square.draw()
+    pygame.display.flip()
+
+    steps = iter(steps)
+    frame = 0
     while True:
         pygame.event.pump()
-        theSquares = []
-        initXLoc = 0
-        initYLoc = 0
-        startX, startY, editable, number = 0, 0, "N", 0
-        for y in range(9):
-            for x in range(9):
-                if x in (0, 1, 2):  startX = (x * 57) + 38
-                if x in (3, 4, 5):  startX = (x * 57) + 99
-                if x in (6, 7, 8):  startX = (x * 57) + 159
-
-                if y in (0, 1, 2):  startY = (y * 57) + 35
-                if y in (3, 4, 5):  startY = (y * 57) + 100
-                if y in (6, 7, 8):  startY = (y * 57) + 165
-                string_number = values[rows[y] + cols[x]]
-                if len(string_number) > 1 or string_number == '' or string_number == '.':
-                    number = None
-                else:
-                    number = int(string_number)
-                theSquares.append(SudokuSquare.SudokuSquare(number, startX, startY, editable, x, y))
-
-        screen.blit(background_image, (0, 0))
-        for num in theSquares:
-            num.draw()
-
-        pygame.display.flip()
-        pygame.display.update()
-        clock.tick(5)
-
-        if len(assignments) == 0:
+        if frames is not None:
+            pygame.image.save(screen, os.path.join(frames, "frame_{:05d}.png".format(frame)))
+        else:
+            clock.tick(fps)
+        frame += 1
+
+        step = next(steps, None)
+        if step is None:
             break
-        box, value = assignments.pop()
+        box, value = step
         values[box] = value
 
+        # Redraw only the square that changed
+        square = squares[box]
+        square.set_number(box_number(value))
+        screen.blit(background_image, square.rect, square.rect)
+        square.draw()
+        pygame.display.update(square.rect)
+
+    if frames is not None:
+        pygame.quit()
+        return
+
     # leave game showing until closed by user
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
+
+
+if __name__ == "__main__":
+    import solution
+
+    parser = argparse.ArgumentParser(description="Replay the solution of a diagonal Sudoku.")
+    parser.add_argument('grid', nargs='?',
+                        default='........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.',
+                        help="the 81-character puzzle to solve and replay")
+    parser.add_argument('--frames', default=None,
+                        help="render headless and save the frames as PNG images in this directory")
+    parser.add_argument('--fps', type=int, default=5,
+                        help="frames per second of the windowed replay")
+    args = parser.parse_args()
+
+    # The replay starts with the solver's first step and follows the search
+    play(grid2values(args.grid), solution.solve_steps(args.grid), args.frames, args.fps)
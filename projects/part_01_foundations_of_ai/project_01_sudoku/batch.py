@@ -0,0 +1,174 @@
+"""Vectorized batch solver for diagonal Sudoku puzzles.
+
+A batch of N puzzles is held as an (N, 81, 9) boolean tensor of candidates, and
+the eliminate and only choice strategies run as array operations over every
+unit in `unitlist` (including the two diagonal units) for all puzzles at once.
+Puzzles that stall before being solved drop back to the depth first search of
+the bitmask engine one at a time.
+
+This module requires NumPy.
+"""
+import numpy as np
+
+import bitmask
+from utils import boxes
+
+
+N_BOXES = len(boxes)
+N_DIGITS = len(bitmask.digits)
+
+# PEER_MATRIX[i, j] is 1 when box j is a peer of box i, UNIT_MATRIX[u, i] is 1
+# when box i belongs to unit u. The matrices and the candidates are multiplied
+# as float32, which NumPy hands to BLAS (integer matmul is a plain loop); the
+# products are counts of at most 20, so they are exact.
+PEER_MATRIX = np.zeros((N_BOXES, N_BOXES), dtype=np.float32)
+for _i, _peers in enumerate(bitmask.PEERS):
+    PEER_MATRIX[_i, list(_peers)] = 1
+
+UNIT_MATRIX = np.zeros((len(bitmask.UNITS), N_BOXES), dtype=np.float32)
+for _u, _unit in enumerate(bitmask.UNITS):
+    UNIT_MATRIX[_u, list(_unit)] = 1
+
+DIGIT_BITS = (1 << np.arange(N_DIGITS)).astype(np.int64)
+
+
+def grids2tensor(grids):
+    """Convert a sequence of grid strings into an (N, 81, 9) candidate tensor
+
+    Parameters
+    ----------
+    grids(list)
+        a list of strings representing sudoku grids.
+
+    Returns
+    -------
+    numpy.ndarray
+        boolean tensor where [n, i, d] is True if digit d+1 is a candidate of
+        box i in puzzle n
+    """
+    chars = np.frombuffer(''.join(grids).encode('ascii'), dtype=np.uint8)
+    chars = chars.reshape(len(grids), N_BOXES)
+    digits = chars.astype(np.int16) - ord('1')
+    empty = chars == ord('.')
+
+    cand = np.zeros((len(grids), N_BOXES, N_DIGITS), dtype=bool)
+    cand[empty] = True
+    n, i = np.nonzero(~empty)
+    cand[n, i, digits[n, i]] = True
+    return cand
+
+
+def tensor2cells(cand):
+    """Convert one (81, 9) candidate matrix into a bitmask cells list"""
+    return (cand.astype(np.int64) @ DIGIT_BITS).tolist()
+
+
+def eliminate(cand):
+    """Remove the digit of every solved box from its peers, for every puzzle
+
+    Parameters
+    ----------
+    cand(numpy.ndarray)
+        boolean candidate tensor of shape (N, 81, 9)
+
+    Returns
+    -------
+    numpy.ndarray
+        The candidate tensor with the assigned values eliminated from peers
+    """
+    solved = cand & (cand.sum(axis=2) == 1)[:, :, None]
+    blocked = np.matmul(PEER_MATRIX, solved.astype(np.float32)) > 0
+    return cand & ~blocked
+
+
+def only_choice(cand):
+    """Assign every digit that has a single possible place in a unit, for every puzzle
+
+    Parameters
+    ----------
+    cand(numpy.ndarray)
+        boolean candidate tensor of shape (N, 81, 9)
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        The candidate tensor with all only choices assigned, and a boolean
+        vector marking the puzzles found to be contradictory
+    """
+    counts = np.matmul(UNIT_MATRIX, cand.astype(np.float32))
+    singles = (counts == 1).astype(np.float32)
+    hits = (np.matmul(UNIT_MATRIX.T, singles) > 0) & cand
+
+    hit_counts = hits.sum(axis=2)
+    assigned = hit_counts > 0
+    cand = np.where(assigned[:, :, None], hits, cand)
+
+    invalid = (counts == 0).any(axis=(1, 2)) | (hit_counts > 1).any(axis=1)
+    return cand, invalid
+
+
+def reduce_batch(cand):
+    """Apply eliminate and only choice to every puzzle until none of them change
+
+    Parameters
+    ----------
+    cand(numpy.ndarray)
+        boolean candidate tensor of shape (N, 81, 9)
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        The reduced candidate tensor, and a boolean vector marking the puzzles
+        found to be unsolvable
+    """
+    invalid = np.zeros(len(cand), dtype=bool)
+    active = np.arange(len(cand))
+
+    while len(active):
+        before = cand[active]
+        after, bad = only_choice(eliminate(before))
+        bad |= (after.sum(axis=2) == 0).any(axis=1)
+
+        cand[active] = after
+        invalid[active[bad]] = True
+
+        changed = (after != before).any(axis=(1, 2))
+        active = active[changed & ~bad]
+
+    return cand, invalid
+
+
+def solve_batch(grids):
+    """Solve many Sudoku puzzles at once
+
+    Parameters
+    ----------
+    grids(iterable)
+        strings representing sudoku grids.
+
+    Returns
+    -------
+    list
+        For each grid, the dictionary representation of the final sudoku grid
+        or False if no solution exists.
+    """
+    grids = list(grids)
+    if not grids:
+        return []
+
+    cand, invalid = reduce_batch(grids2tensor(grids))
+    solved = (cand.sum(axis=2) == 1).all(axis=1)
+
+    results = []
+    for n in range(len(grids)):
+        if invalid[n]:
+            results.append(False)
+            continue
+        cells = tensor2cells(cand[n])
+        if not solved[n]:
+            cells = bitmask.search(cells)
+            if cells is False:
+                results.append(False)
+                continue
+        results.append(bitmask.cells2values(cells))
+    return results
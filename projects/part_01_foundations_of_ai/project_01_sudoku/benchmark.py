@@ -0,0 +1,165 @@
+"""Benchmark the Sudoku solving engines on difficulty-tiered puzzle sets.
+
+The puzzle sets live in puzzles/<tier>.txt, one diagonal Sudoku with a unique
+solution per line:
+
+    easy          36 clues, solved by constraint propagation alone
+    hard          minimal puzzles (no clue can be removed) needing some search
+    pathological  the minimal puzzles that needed the most search nodes
+
+For every engine and tier the benchmark reports puzzles/sec, p50/p99 latency,
+search nodes visited and peak memory, and can write the results as JSON to
+compare them across commits.
+
+Usage:
+
+    python benchmark.py -e search bitmask dlx -t hard pathological -o results.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+from collections import Counter
+
+import solution
+
+
+TIERS = ['easy', 'hard', 'pathological']
+ENGINES = ['search', 'trail', 'bitmask', 'strategies', 'kernel', 'sat', 'dlx']
+PUZZLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'puzzles')
+
+
+def load_tier(tier):
+    """Return the list of grids of a puzzle tier"""
+    with open(os.path.join(PUZZLE_DIR, tier + '.txt')) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def percentile(data, pct):
+    """Return the nearest-rank percentile of a list of numbers"""
+    data = sorted(data)
+    rank = max(0, min(len(data) - 1, int(math.ceil(pct / 100. * len(data))) - 1))
+    return data[rank]
+
+
+def peak_memory(engine, grids):
+    """Return the peak memory (in bytes) allocated while solving any of `grids`"""
+    peak = 0
+    for grid in grids:
+        tracemalloc.start()
+        solution.solve(grid, engine)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def run_engine(engine, grids, repeat=1):
+    """Solve every grid `repeat` times with one engine and summarize the run
+
+    Returns
+    -------
+    dict
+        puzzles/sec, latency percentiles in milliseconds, search nodes, peak
+        memory and the number of puzzles the engine failed to solve
+    """
+    latencies = []
+    nodes = []
+    failures = 0
+
+    for _ in range(repeat):
+        for grid in grids:
+            stats = Counter()
+            start = timeit.default_timer()
+            values = solution.solve(grid, engine, stats)
+            latencies.append(1000 * (timeit.default_timer() - start))
+            nodes.append(stats['nodes'])
+            failures += values is False
+
+    total_ms = sum(latencies)
+    return {
+        'puzzles': len(latencies),
+        'puzzles_per_sec': 1000. * len(latencies) / total_ms if total_ms else 0.,
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+        'mean_nodes': float(sum(nodes)) / len(nodes),
+        'max_nodes': max(nodes),
+        'peak_memory_bytes': peak_memory(engine, grids),
+        'failures': failures,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=PUZZLE_DIR, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(engines=ENGINES, tiers=TIERS, repeat=1):
+    """Benchmark each engine on each tier
+
+    Returns
+    -------
+    dict
+        the run metadata and a list of result rows, one per (engine, tier)
+    """
+    results = []
+    for tier in tiers:
+        grids = load_tier(tier)
+        for engine in engines:
+            row = {'engine': engine, 'tier': tier}
+            row.update(run_engine(engine, grids, repeat))
+            results.append(row)
+
+    return {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def print_report(report):
+    header = "{:<14}{:<10}{:>12}{:>10}{:>10}{:>12}{:>10}{:>12}".format(
+        'tier', 'engine', 'puzzles/s', 'p50 ms', 'p99 ms', 'mean nodes', 'max nodes', 'peak KiB')
+    print(header)
+    print('-' * len(header))
+    for row in report['results']:
+        print("{:<14}{:<10}{:>12.1f}{:>10.2f}{:>10.2f}{:>12.1f}{:>10}{:>12.1f}".format(
+            row['tier'], row['engine'], row['puzzles_per_sec'], row['p50_ms'], row['p99_ms'],
+            row['mean_nodes'], row['max_nodes'], row['peak_memory_bytes'] / 1024.))
+        if row['failures']:
+            print("    {} puzzles were not solved".format(row['failures']))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Sudoku solving engines on " +
+                                     "difficulty-tiered diagonal Sudoku sets.")
+    parser.add_argument('-e', '--engines', nargs='+', default=ENGINES, choices=ENGINES,
+                        help="engines to benchmark")
+    parser.add_argument('-t', '--tiers', nargs='+', default=TIERS, choices=TIERS,
+                        help="puzzle tiers to run")
+    parser.add_argument('-r', '--repeat', type=int, default=1,
+                        help="number of times every puzzle is solved")
+    parser.add_argument('-o', '--output',
+                        help="write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.engines, args.tiers, args.repeat)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
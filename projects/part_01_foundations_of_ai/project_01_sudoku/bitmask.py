@@ -0,0 +1,509 @@
+"""Bitmask board engine for diagonal Sudoku.
+
+Each box holds its candidates as an integer bitmask (bit d-1 is set while digit
+d is still possible) and the board is a flat list of such cells ordered like
+`boxes`. Peer and unit tables come precomputed as tuples of cell indexes from a
+`SudokuTopology`, so the strategies below work on small ints and list indexing
+instead of string edits and dict lookups.
+
+Every function takes an optional topology, the 9x9 diagonal board by default,
+so the same engine also solves 4x4, 16x16 and 25x25 boards, with or without
+diagonal units.
+
+Use `grid2cells` / `cells2values` to move between this representation and the
+string and dictionary forms used by `solution.py`.
+"""
+from collections import deque
+
+from profiling import strategy_runner
+from topology import get_topology
+
+
+DEFAULT = get_topology(3, diagonal=True)
+
+# Tables of the default 9x9 board
+digits = DEFAULT.symbols
+ALL = DEFAULT.all
+UNITS = DEFAULT.units
+PEERS = DEFAULT.peers
+
+
+def grid2cells(grid, topology=DEFAULT):
+    """Convert a grid string into a list of candidate masks.
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    topology(SudokuTopology)
+        the board the grid is played on
+
+    Returns
+    -------
+    list
+        a list of candidate masks, with all digits set for the empty boxes
+    """
+    return topology.grid2cells(grid)
+
+
+def cells2grid(cells, topology=DEFAULT):
+    """Convert a list of candidate masks into a grid string ('.' for unsolved boxes)"""
+    return topology.cells2grid(cells)
+
+
+def values2cells(values, topology=DEFAULT):
+    """Convert the dictionary board representation into a list of candidate masks"""
+    return topology.values2cells(values)
+
+
+def cells2values(cells, topology=DEFAULT):
+    """Convert a list of candidate masks into the dictionary board representation
+
+    Parameters
+    ----------
+    cells(list)
+        a list of candidate masks
+
+    topology(SudokuTopology)
+        the board the cells belong to
+
+    Returns
+    -------
+    dict
+        a dictionary of the form {'box_name': '123456789', ...}
+    """
+    return topology.cells2values(cells)
+
+
+def iter_bits(mask):
+    """Yield the single-bit masks set in `mask`, lowest digit first"""
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+def eliminate(cells, topology=DEFAULT):
+    """Remove the digit of every solved box from the candidates of its peers
+
+    Parameters
+    ----------
+    cells(list)
+        a list of candidate masks
+
+    Returns
+    -------
+    list
+        The cells with the assigned values eliminated from peers
+    """
+    popcount, peers, full = topology.popcount, topology.peers, topology.all
+    for i, mask in enumerate(cells):
+        if popcount(mask) == 1:
+            keep = full ^ mask
+            for peer in peers[i]:
+                cells[peer] &= keep
+    return cells
+
+
+def only_choice(cells, topology=DEFAULT):
+    """Assign every digit that has a single possible place in one of its units
+
+    Parameters
+    ----------
+    cells(list)
+        a list of candidate masks
+
+    Returns
+    -------
+    list or False
+        The cells with all only choices assigned, or False if some unit cannot
+        place every digit
+    """
+    popcount, full = topology.popcount, topology.all
+    for unit in topology.units:
+        once = twice = 0
+        for i in unit:
+            mask = cells[i]
+            twice |= once & mask
+            once |= mask
+        if once != full:
+            return False
+        singles = once & ~twice
+        if not singles:
+            continue
+        for i in unit:
+            mask = cells[i] & singles
+            if mask:
+                if popcount(mask) > 1:
+                    return False
+                cells[i] = mask
+    return cells
+
+
+def naked_twins(cells, topology=DEFAULT):
+    """Eliminate the candidates of naked twins from the other boxes of their unit
+
+    Parameters
+    ----------
+    cells(list)
+        a list of candidate masks
+
+    Returns
+    -------
+    list
+        The cells with the naked twins eliminated from the shared units
+    """
+    popcount, full = topology.popcount, topology.all
+    for unit in topology.units:
+        seen = {}
+        for i in unit:
+            mask = cells[i]
+            if popcount(mask) != 2:
+                continue
+            if mask not in seen:
+                seen[mask] = i
+                continue
+            twin = seen[mask]
+            keep = full ^ mask
+            for j in unit:
+                if j != i and j != twin:
+                    cells[j] &= keep
+    return cells
+
+
+def only_choice_unit(cells, unit, topology=DEFAULT):
+    """Apply the only choice strategy to a single unit
+
+    Returns
+    -------
+    list or False
+        The indexes of the cells that were assigned, or False if some digit
+        has no possible place left in the unit
+    """
+    once = twice = 0
+    for i in unit:
+        mask = cells[i]
+        twice |= once & mask
+        once |= mask
+    if once != topology.all:
+        return False
+    singles = once & ~twice
+    if not singles:
+        return []
+
+    popcount = topology.popcount
+    changed = []
+    for i in unit:
+        mask = cells[i] & singles
+        if mask:
+            if popcount(mask) > 1:
+                return False
+            if mask != cells[i]:
+                cells[i] = mask
+                changed.append(i)
+    return changed
+
+
+def naked_twins_unit(cells, unit, topology=DEFAULT):
+    """Apply the naked twins strategy to a single unit
+
+    Returns
+    -------
+    list or False
+        The indexes of the cells that lost candidates, or False if a cell ran
+        out of candidates
+    """
+    popcount = topology.popcount
+    seen = {}
+    twins = []
+    for i in unit:
+        mask = cells[i]
+        if popcount(mask) != 2:
+            continue
+        if mask in seen:
+            twins.append((mask, seen[mask], i))
+        else:
+            seen[mask] = i
+
+    changed = []
+    full = topology.all
+    for mask, twin, other in twins:
+        keep = full ^ mask
+        for j in unit:
+            if j != twin and j != other and cells[j] & mask:
+                cells[j] &= keep
+                if not cells[j]:
+                    return False
+                changed.append(j)
+    return changed
+
+
+def reduce_puzzle(cells, topology=DEFAULT, pipeline=None, stats=None):
+    """Reduce the cells by repeatedly applying all constraint strategies
+
+    Like `solution.reduce_puzzle`, propagation is driven by two work queues:
+    solved cells whose digit still has to be eliminated from their peers, and
+    units containing a cell that changed, which are re-checked with the only
+    choice and naked twins strategies.
+
+    Parameters
+    ----------
+    cells(list)
+        a list of candidate masks
+
+    topology(SudokuTopology)
+        the board the cells belong to
+
+    pipeline(StrategyPipeline or None)
+        advanced strategies (see strategies.py) to try whenever eliminate,
+        only choice and naked twins stall
+
+    stats(dict or None)
+        if given, a counter whose 'passes' entry counts the iterations of the
+        propagation loop; a profiling.SolverStats also measures every strategy
+
+    Returns
+    -------
+    list or False
+        The cells once the strategies no longer produce any changes, or False if
+        the puzzle is unsolvable
+    """
+    if 0 in cells:
+        return False
+
+    popcount, peers, cell_units = topology.popcount, topology.peers, topology.cell_units
+    full, units = topology.all, topology.units
+
+    solved = deque(i for i, mask in enumerate(cells) if popcount(mask) == 1)
+    dirty = deque(range(len(units)))
+    queued = [True] * len(units)
+
+    def mark_changed(changed):
+        for i in changed:
+            if popcount(cells[i]) == 1:
+                solved.append(i)
+            for u in cell_units[i]:
+                if not queued[u]:
+                    queued[u] = True
+                    dirty.append(u)
+
+    def eliminate_solved(cells):
+        while solved:
+            i = solved.popleft()
+            mask = cells[i]
+            keep = full ^ mask
+            for peer in peers[i]:
+                if cells[peer] & mask:
+                    remaining = cells[peer] & keep
+                    if not remaining:
+                        return False
+                    cells[peer] = remaining
+                    if popcount(remaining) == 1:
+                        solved.append(peer)
+                    for u in cell_units[peer]:
+                        if not queued[u]:
+                            queued[u] = True
+                            dirty.append(u)
+        return cells
+
+    run = strategy_runner(stats)
+    while True:
+        while solved or dirty:
+            if stats is not None:
+                stats['passes'] += 1
+
+            if solved and run('eliminate', eliminate_solved, cells) is False:
+                return False
+
+            if dirty:
+                u = dirty.popleft()
+                queued[u] = False
+
+                changed = run('only_choice', only_choice_unit, cells, units[u], topology)
+                if changed is False:
+                    return False
+                mark_changed(changed)
+
+                changed = run('naked_twins', naked_twins_unit, cells, units[u], topology)
+                if changed is False:
+                    return False
+                mark_changed(changed)
+
+        if pipeline is None:
+            return cells
+        before = cells[:]
+        if not pipeline.apply(cells, topology, stats):
+            return cells
+        if 0 in cells:
+            return False
+        mark_changed([i for i, mask in enumerate(cells) if mask != before[i]])
+
+
+def search(cells, stats=None, topology=DEFAULT, pipeline=None, depth=0, order=None):
+    """Solve the cells with constraint propagation and depth first search
+
+    Parameters
+    ----------
+    cells(list)
+        a list of candidate masks
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) of the search nodes,
+        backtracks and maximum depth, see profiling.py
+
+    topology(SudokuTopology)
+        the board to solve, the 9x9 diagonal board by default
+
+    pipeline(StrategyPipeline or None)
+        advanced strategies to run when the basic ones stall
+
+    depth(int)
+        the depth of this node in the search tree
+
+    order(callable or None)
+        if given, called with the list of candidate bits of the box branched
+        on, it returns them in the order to try (e.g. shuffled); by default
+        the candidates are tried from the lowest digit up
+
+    Returns
+    -------
+    list or False
+        The solved cells or False if no solution exists
+    """
+    if stats is not None:
+        stats['nodes'] += 1
+        if depth > stats['max_depth']:
+            stats['max_depth'] = depth
+
+    cells = reduce_puzzle(cells, topology, pipeline, stats)
+
+    if cells is False:
+        return False
+
+    popcount = topology.popcount
+    unsolved = [(popcount(mask), i) for i, mask in enumerate(cells) if popcount(mask) > 1]
+    if not unsolved:
+        return cells
+
+    # Choose one of the unfilled boxes with the fewest possibilities
+    count, i = min(unsolved)
+
+    bits = iter_bits(cells[i]) if order is None else order(list(iter_bits(cells[i])))
+    for bit in bits:
+        new_cells = cells[:]
+        new_cells[i] = bit
+
+        solved_cells = search(new_cells, stats, topology, pipeline, depth + 1, order)
+
+        if solved_cells is not False:
+            return solved_cells
+        if stats is not None:
+            stats['backtracks'] += 1
+
+    return False
+
+
+def solve(grid, stats=None, topology=DEFAULT, pipeline=None):
+    """Find the solution to a Sudoku puzzle with the bitmask engine
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) of the search nodes,
+        backtracks and maximum depth, see profiling.py
+
+    topology(SudokuTopology)
+        the board to solve, the 9x9 diagonal board by default
+
+    pipeline(StrategyPipeline or None)
+        advanced strategies to run when the basic ones stall
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    cells = search(topology.grid2cells(grid), stats, topology, pipeline)
+    if cells is False:
+        return False
+    return topology.cells2values(cells)
+
+
+def count(cells, limit, topology=DEFAULT, stats=None):
+    """Count the solutions below the cells, stopping once `limit` are found
+
+    Parameters
+    ----------
+    cells(list)
+        a list of candidate masks
+
+    limit(int or None)
+        the number of solutions after which counting stops, or None to count
+        them all
+
+    topology(SudokuTopology)
+        the board the cells belong to
+
+    stats(dict or None)
+        if given, a counter whose 'nodes' entry is incremented for every
+        search node visited
+
+    Returns
+    -------
+    int
+        The number of solutions found (at most `limit`)
+    """
+    if stats is not None:
+        stats['nodes'] += 1
+
+    cells = reduce_puzzle(cells, topology)
+    if cells is False:
+        return 0
+
+    popcount = topology.popcount
+    unsolved = [(popcount(mask), i) for i, mask in enumerate(cells) if popcount(mask) > 1]
+    if not unsolved:
+        return 1
+
+    count_, i = min(unsolved)
+    found = 0
+    for bit in iter_bits(cells[i]):
+        new_cells = cells[:]
+        new_cells[i] = bit
+        found += count(new_cells, None if limit is None else limit - found, topology, stats)
+        if limit is not None and found >= limit:
+            break
+    return found
+
+
+def count_solutions(grid, limit=2, topology=DEFAULT, stats=None):
+    """Count the solutions of a Sudoku puzzle, stopping once `limit` are found
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    limit(int or None)
+        the number of solutions after which counting stops, or None to count
+        them all
+
+    topology(SudokuTopology)
+        the board to solve, the 9x9 diagonal board by default
+
+    stats(dict or None)
+        if given, a counter whose 'nodes' entry is incremented for every
+        search node visited
+
+    Returns
+    -------
+    int
+        The number of solutions found (at most `limit`)
+    """
+    return count(topology.grid2cells(grid), limit, topology, stats)
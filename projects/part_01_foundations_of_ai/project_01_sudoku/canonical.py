@@ -0,0 +1,187 @@
+"""Canonical forms of diagonal Sudoku grids and a persistent solution cache.
+
+Two puzzles are equivalent when one is mapped onto the other by a symmetry of
+the diagonal Sudoku board followed by a relabelling of the digits. The
+symmetries kept here are those that map the two diagonals onto themselves:
+
+    geometry     the 8 rotations and reflections of the square
+    permutation  the same permutation p of the rows and of the columns, where p
+                 moves bands and rows within bands and p(8 - i) = 8 - p(i), so
+                 the middle band and row stay in place (24 such permutations)
+
+The canonical form of a grid (in the `values2grid` string format) is the
+smallest string among all its transforms, each with the digits relabelled in
+order of first appearance. `SolutionCache` stores the canonical form of every
+solved puzzle with its solution in a sqlite database, so an equivalent puzzle
+is answered by mapping the stored solution back through the inverse transform.
+"""
+import sqlite3
+
+from itertools import permutations
+
+from utils import grid2values, values2grid
+
+
+digits = '123456789'
+SIZE = 9
+
+
+def line_permutations():
+    """Return the row (and column) permutations that keep both diagonals"""
+    perms = []
+    for band in ((0, 1, 2), (2, 1, 0)):
+        for outer in permutations(range(3)):
+            for middle in ((0, 1, 2), (2, 1, 0)):
+                within = (outer, middle, tuple(2 - outer[2 - i] for i in range(3)))
+                perm = [0] * SIZE
+                for b in range(3):
+                    for i in range(3):
+                        perm[3 * b + i] = 3 * band[b] + within[band[b]][i]
+                perms.append(tuple(perm))
+    return perms
+
+
+def geometries():
+    """Return the 8 rotations and reflections of the square as (r, c) -> (r, c) maps"""
+    last = SIZE - 1
+    return [lambda r, c: (r, c), lambda r, c: (c, last - r),
+            lambda r, c: (last - r, last - c), lambda r, c: (last - c, r),
+            lambda r, c: (c, r), lambda r, c: (last - c, last - r),
+            lambda r, c: (r, last - c), lambda r, c: (last - r, c)]
+
+
+def build_transforms():
+    """Return every distinct symmetry as a tuple `t` of cell indexes, where the
+    transformed grid is ''.join(grid[t[k]] for k in range(81))"""
+    transforms = set()
+    for perm in line_permutations():
+        for geometry in geometries():
+            t = [0] * SIZE * SIZE
+            for r in range(SIZE):
+                for c in range(SIZE):
+                    gr, gc = geometry(perm[r], perm[c])
+                    t[gr * SIZE + gc] = r * SIZE + c
+            transforms.add(tuple(t))
+    return sorted(transforms)
+
+
+TRANSFORMS = build_transforms()
+
+
+def relabel(grid):
+    """Relabel the digits of a grid in order of first appearance
+
+    Returns
+    -------
+    (string, dict)
+        The relabelled grid and the map from original to new digits
+    """
+    labels = {}
+    for val in grid:
+        if val != '.' and val not in labels:
+            labels[val] = digits[len(labels)]
+    return ''.join(labels.get(val, '.') for val in grid), labels
+
+
+def canonical_form(grid):
+    """Return the canonical form of a grid
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    Returns
+    -------
+    (string, tuple, dict)
+        The canonical grid, the transform (see `build_transforms`) and the
+        digit labels that map `grid` onto it
+    """
+    best = None
+    for t in TRANSFORMS:
+        candidate, labels = relabel(''.join(grid[i] for i in t))
+        if best is None or candidate < best[0]:
+            best = (candidate, t, labels)
+    return best
+
+
+def to_canonical(grid, transform, labels):
+    """Map a grid (e.g. the solution of the original puzzle) into canonical form;
+    digits without a label get the unused labels in increasing order"""
+    labels = dict(labels)
+    unused = iter(d for d in digits if d not in labels.values())
+    for val in grid:
+        if val != '.' and val not in labels:
+            labels[val] = next(unused)
+    return ''.join(labels.get(grid[i], '.') for i in transform)
+
+
+def from_canonical(grid, transform, labels):
+    """Map a canonical grid (e.g. a cached solution) back onto the original puzzle"""
+    inverse = dict((new, old) for old, new in labels.items())
+    unused = iter(d for d in digits if d not in labels)
+    for val in grid:
+        if val != '.' and val not in inverse:
+            inverse[val] = next(unused)
+    original = ['.'] * len(grid)
+    for k, i in enumerate(transform):
+        original[i] = inverse.get(grid[k], '.')
+    return ''.join(original)
+
+
+class SolutionCache(object):
+    """Solutions of canonical puzzles, persisted in a sqlite database
+
+    Parameters
+    ----------
+    path(string)
+        the database file (':memory:' for a cache private to this process)
+    """
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                "(puzzle TEXT PRIMARY KEY, solution TEXT)")
+        self.hits = self.misses = 0
+        self.last = (None, None)
+
+    def canonical_form(self, grid):
+        """`canonical_form`, remembered for the last grid so that a lookup
+        followed by a store canonicalizes the puzzle once"""
+        if self.last[0] != grid:
+            self.last = (grid, canonical_form(grid))
+        return self.last[1]
+
+    def lookup(self, grid):
+        """Return the cached solution of a puzzle
+
+        Returns
+        -------
+        dict, False or None
+            The dictionary representation of the solution, False if the
+            puzzle is known to have no solution, or None on a cache miss
+        """
+        canonical, transform, labels = self.canonical_form(grid)
+        row = self.connection.execute("SELECT solution FROM solutions WHERE puzzle = ?",
+                                      (canonical,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if row[0] is None:
+            return False
+        return grid2values(from_canonical(row[0], transform, labels))
+
+    def store(self, grid, values):
+        """Store the solution of a puzzle (False if it has none)"""
+        canonical, transform, labels = self.canonical_form(grid)
+        solution = to_canonical(values2grid(values), transform, labels) if values else None
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                                    (canonical, solution))
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,177 @@
+"""Solve a corpus of Sudoku puzzles with a pool of worker processes.
+
+Puzzles are read one grid per line from a file (or stdin), 81 characters for
+the 9x9 board or 16, 256 or 625 for the other sizes of topology.py, and handed
+to the workers in chunks, with only a bounded number of chunks in flight, so
+the corpus is never loaded into memory as a whole. For every puzzle one
+tab-separated line is written, in input order, as soon as its chunk is done:
+
+    <grid>  <milliseconds>  <search nodes>
+
+where <grid> is the solved grid in the same format as the input, or the input
+grid unchanged when the puzzle has no solution. A line that is not a puzzle
+(wrong length or unexpected characters) does not stop the run; it gets the
+line
+
+    <input line>  error  <message>
+
+Usage:
+
+    python corpus.py puzzles.txt -o solved.txt -e bitmask -p 4
+"""
+import argparse
+import sys
+import timeit
+
+from collections import Counter, deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+
+import solution
+from topology import topology_for_grid
+
+
+def read_puzzles(lines):
+    """Yield the grid on every non-blank line of `lines`"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def check_grid(grid):
+    """Return the topology of `grid`, raising a ValueError unless it is a
+    Sudoku grid of a supported size made of its digits and '.'"""
+    topology = topology_for_grid(grid)
+    symbols = topology.symbols + '.'
+    unexpected = sorted(set(val for val in grid if val not in symbols))
+    if unexpected:
+        raise ValueError("Unexpected characters in the grid: {}".format(''.join(unexpected)))
+    return topology
+
+
+def solve_one(grid, engine='bitmask'):
+    """Solve one puzzle and measure it
+
+    Returns
+    -------
+    (string, float, int, string or None)
+        the solved grid (or the input grid if there is no solution), the time
+        spent in milliseconds, the number of search nodes visited, and the
+        error message if the input is not a valid puzzle (else None)
+    """
+    stats = Counter()
+    start = timeit.default_timer()
+    try:
+        topology = check_grid(grid)
+        values = solution.solve(grid, engine, stats, topology)
+    except ValueError as error:
+        return grid, 1000 * (timeit.default_timer() - start), stats['nodes'], str(error)
+    elapsed = 1000 * (timeit.default_timer() - start)
+    if values:
+        grid = topology.cells2grid(topology.values2cells(values))
+    return grid, elapsed, stats['nodes'], None
+
+
+def solve_chunk(chunk, engine='bitmask'):
+    return [solve_one(grid, engine) for grid in chunk]
+
+
+def iter_chunks(puzzles, chunksize):
+    puzzles = iter(puzzles)
+    while True:
+        chunk = list(islice(puzzles, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(puzzles, engine='bitmask', processes=None, chunksize=64):
+    """Solve every puzzle of an iterable, yielding the results in input order
+
+    Parameters
+    ----------
+    puzzles(iterable)
+        strings representing sudoku grids; consumed lazily
+
+    engine(string)
+        the `solution.solve` engine used by the workers
+
+    processes(int or None)
+        the number of worker processes (all cores when None); 1 solves the
+        puzzles in this process
+
+    chunksize(int)
+        the number of puzzles handed to a worker at a time
+
+    Returns
+    -------
+    generator
+        (grid, milliseconds, nodes, error) tuples as returned by `solve_one`
+    """
+    processes = processes or cpu_count()
+    if processes == 1:
+        for grid in puzzles:
+            yield solve_one(grid, engine)
+        return
+
+    pending = deque()
+    with Pool(processes) as pool:
+        for chunk in iter_chunks(puzzles, chunksize):
+            pending.append(pool.apply_async(solve_chunk, (chunk, engine)))
+            # Bound the work in flight so that the input is read as it is solved
+            if len(pending) >= 2 * processes:
+                for result in pending.popleft().get():
+                    yield result
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+
+
+def main(infile, outfile, engine, processes, chunksize):
+    count = solved = errors = 0
+    total_ms = 0.
+    start = timeit.default_timer()
+
+    for grid, elapsed, nodes, error in run(read_puzzles(infile), engine, processes, chunksize):
+        count += 1
+        if error is not None:
+            outfile.write("{}\terror\t{}\n".format(grid, error))
+            errors += 1
+            continue
+        outfile.write("{}\t{:.3f}\t{}\n".format(grid, elapsed, nodes))
+        solved += '.' not in grid
+        total_ms += elapsed
+
+    wall = timeit.default_timer() - start
+    print("Solved {} of {} puzzles in {:.2f}s ({:.1f} puzzles/sec, {:.3f} ms of solver time per puzzle)".format(
+        solved, count, wall, count / wall if wall else 0., total_ms / count if count else 0.),
+        file=sys.stderr)
+    if errors:
+        print("Skipped {} invalid lines".format(errors), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a file of Sudoku puzzles (one grid per line) " +
+                                     "with a pool of worker processes.")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="file of puzzles, one grid per line ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="file to write the solved grids to ('-' for stdout)")
+    parser.add_argument('-e', '--engine', default='bitmask', choices=['search', 'trail', 'bitmask', 'strategies', 'kernel', 'sat', 'dlx'],
+                        help="solving backend passed to solution.solve")
+    parser.add_argument('-p', '--processes', type=int, default=None,
+                        help="number of worker processes (default: all cores)")
+    parser.add_argument('-c', '--chunksize', type=int, default=64,
+                        help="number of puzzles handed to a worker at a time")
+    args = parser.parse_args()
+
+    infile = sys.stdin if args.input == '-' else open(args.input)
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        main(infile, outfile, args.engine, args.processes, args.chunksize)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
@@ -0,0 +1,245 @@
+"""Dancing links (Algorithm X) exact cover engine for diagonal Sudoku.
+
+The puzzle is encoded as an exact cover problem with one row per (box, digit)
+candidate and one column per constraint: every box holds exactly one digit, and
+every unit of the board topology (rows, columns, squares and the two diagonals) holds
+each digit exactly once. The sparse matrix is kept as doubly linked lists in
+flat integer arrays, which are built once at import and copied for each solve.
+"""
+from utils import boxes, topology
+
+
+digits = '123456789'
+N_DIGITS = len(digits)
+
+BOX_UNITS = topology.cell_units
+N_COLS = len(boxes) + len(topology.units) * N_DIGITS
+
+
+def row_columns(i, d):
+    """Return the constraint columns covered by placing digit index `d` in box `i`"""
+    return [i] + [len(boxes) + u * N_DIGITS + d for u in BOX_UNITS[i]]
+
+
+def build_matrix():
+    """Build the linked exact cover matrix for an empty board
+
+    Returns
+    -------
+    tuple
+        (L, R, U, D, C, S, ROW, ROW_NODE) where the first five lists hold the
+        left, right, up, down and column links of every node (node 0 is the
+        root and nodes 1..N_COLS the column headers), S the size of each
+        column, ROW the candidate row of every node and ROW_NODE the first node
+        of every candidate row
+    """
+    n_headers = N_COLS + 1
+    L = [h - 1 for h in range(n_headers)]
+    R = [h + 1 for h in range(n_headers)]
+    L[0], R[-1] = N_COLS, 0
+    U = list(range(n_headers))
+    D = list(range(n_headers))
+    C = list(range(n_headers))
+    S = [0] * n_headers
+    ROW = [-1] * n_headers
+    ROW_NODE = []
+
+    for i in range(len(boxes)):
+        for d in range(N_DIGITS):
+            row_id = i * N_DIGITS + d
+            first = len(L)
+            ROW_NODE.append(first)
+            for col in row_columns(i, d):
+                header = col + 1
+                node = len(L)
+                L.append(node - 1)
+                R.append(first)
+                U.append(U[header])
+                D.append(header)
+                C.append(header)
+                ROW.append(row_id)
+                D[U[header]] = node
+                U[header] = node
+                S[header] += 1
+            L[first] = len(L) - 1
+            R[len(R) - 1] = first
+            for node in range(first + 1, len(L)):
+                R[node - 1] = node
+
+    return L, R, U, D, C, S, ROW, ROW_NODE
+
+
+MATRIX = build_matrix()
+
+
+class DancingLinks(object):
+    """Exact cover search over a private copy of the Sudoku matrix.
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) whose 'nodes' entry is
+        incremented for every search node visited
+    """
+
+    def __init__(self, grid, stats=None):
+        L, R, U, D, C, S, self.ROW, self.ROW_NODE = MATRIX
+        self.L, self.R, self.U, self.D, self.C, self.S = (
+            list(L), list(R), list(U), list(D), list(C), list(S))
+        self.solution = []
+        self.stats = stats
+        self.valid = self.place_givens(grid)
+
+    def cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    def place_givens(self, grid):
+        """Select the rows of the given digits; return False if they conflict"""
+        covered = set()
+        for i, val in enumerate(grid):
+            if val == '.':
+                continue
+            node = self.ROW_NODE[i * N_DIGITS + digits.index(val)]
+            columns = [node]
+            j = self.R[node]
+            while j != node:
+                columns.append(j)
+                j = self.R[j]
+            for j in columns:
+                if self.C[j] in covered:
+                    return False
+                covered.add(self.C[j])
+                self.cover(self.C[j])
+            self.solution.append(self.ROW[node])
+        return True
+
+    def search(self, limit=1):
+        """Yield the completed solutions (as lists of row ids), at most `limit`
+        of them (None for no limit)"""
+        if not self.valid:
+            return
+        found = 0
+        for row_ids in self._search():
+            yield list(row_ids)
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+    def _search(self):
+        R, D, C, S = self.R, self.D, self.C, self.S
+        if self.stats is not None:
+            self.stats['nodes'] += 1
+        if R[0] == 0:
+            yield self.solution
+            return
+
+        # Choose the column with the fewest remaining rows
+        c = best = R[0]
+        while c != 0:
+            if S[c] < S[best]:
+                best = c
+                if S[best] <= 1:
+                    break
+            c = R[c]
+        c = best
+        if S[c] == 0:
+            return
+
+        self.cover(c)
+        r = D[c]
+        while r != c:
+            self.solution.append(self.ROW[r])
+            j = R[r]
+            while j != r:
+                self.cover(C[j])
+                j = R[j]
+
+            for solution in self._search():
+                yield solution
+
+            j = self.L[r]
+            while j != r:
+                self.uncover(C[j])
+                j = self.L[j]
+            self.solution.pop()
+            r = D[r]
+        self.uncover(c)
+
+
+def rows2values(row_ids):
+    """Convert the chosen candidate rows into the dictionary board representation"""
+    values = {}
+    for row_id in row_ids:
+        i, d = divmod(row_id, N_DIGITS)
+        values[boxes[i]] = digits[d]
+    return values
+
+
+def solve(grid, stats=None):
+    """Find the solution to a Sudoku puzzle with dancing links
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) whose 'nodes' entry is
+        incremented for every search node visited
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    for row_ids in DancingLinks(grid, stats).search(limit=1):
+        return rows2values(row_ids)
+    return False
+
+
+def count_solutions(grid, limit=None):
+    """Count the solutions of a Sudoku puzzle, stopping once `limit` are found
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    limit(int or None)
+        the number of solutions after which counting stops, or None to count
+        them all
+
+    Returns
+    -------
+    int
+        The number of solutions found (at most `limit`)
+    """
+    return sum(1 for _ in DancingLinks(grid).search(limit=limit))
@@ -0,0 +1,172 @@
+"""Generate diagonal Sudoku puzzles with unique solutions.
+
+A puzzle is made in two steps:
+
+    fill   a random complete board is found by the bitmask search, trying the
+           candidates of every box in random order
+    dig    the clues of that board are removed in random order, each removal
+           kept only if the puzzle still has a single solution (see
+           `bitmask.count_solutions`), until the target number of clues is
+           reached
+
+Digging can get stuck above the target, in which case a fresh board is filled,
+up to MAX_ATTEMPTS times.
+Puzzles are generated by a pool of worker processes and written as they come,
+one 81-character grid per line, in the format read by corpus.py.
+
+Usage:
+
+    python generator.py -n 1000 -c 28 -p 4 -s 42 -o puzzles.txt
+"""
+import argparse
+import random
+import sys
+
+from multiprocessing import Pool, cpu_count
+
+import bitmask
+
+
+# The number of boards filled and dug for one puzzle before giving up
+MAX_ATTEMPTS = 100
+
+
+def random_fill(cells, rng, topology=bitmask.DEFAULT):
+    """Complete the cells with a random solution, by the bitmask search trying
+    the candidates of every box in random order
+
+    Returns
+    -------
+    list or False
+        The solved cells or False if no solution exists
+    """
+    def shuffled(bits):
+        rng.shuffle(bits)
+        return bits
+
+    return bitmask.search(cells, topology=topology, order=shuffled)
+
+
+def dig(grid, clues, rng, topology=bitmask.DEFAULT):
+    """Remove clues from a solved grid in random order while the puzzle stays unique
+
+    Returns
+    -------
+    string or None
+        The puzzle with `clues` clues, or None if no further clue could be
+        removed before reaching the target
+    """
+    grid = list(grid)
+    positions = list(range(len(grid)))
+    rng.shuffle(positions)
+    remaining = len(grid)
+
+    for i in positions:
+        if remaining <= clues:
+            break
+        digit = grid[i]
+        grid[i] = '.'
+        if bitmask.count_solutions(''.join(grid), 2, topology) == 1:
+            remaining -= 1
+        else:
+            grid[i] = digit
+
+    return ''.join(grid) if remaining <= clues else None
+
+
+def generate(clues, rng, topology=bitmask.DEFAULT):
+    """Generate one puzzle with `clues` clues and a unique solution
+
+    A unique puzzle gives at least all of its digits but one, so fewer clues
+    than that raise a ValueError, and a RuntimeError is raised when none of
+    MAX_ATTEMPTS boards could be dug down to `clues`.
+    """
+    if not topology.size - 1 <= clues <= topology.n_cells:
+        raise ValueError("A unique puzzle has between {} and {} clues, got {}".format(
+            topology.size - 1, topology.n_cells, clues))
+
+    empty = [topology.all] * topology.n_cells
+    for _ in range(MAX_ATTEMPTS):
+        grid = topology.cells2grid(random_fill(empty, rng, topology))
+        puzzle = dig(grid, clues, rng, topology)
+        if puzzle is not None:
+            return puzzle
+    raise RuntimeError("No puzzle with {} clues found in {} attempts".format(clues, MAX_ATTEMPTS))
+
+
+def generate_chunk(args):
+    """Worker entry point: generate `count` puzzles from a seeded generator"""
+    count, clues, seed = args
+    rng = random.Random(seed)
+    return [generate(clues, rng) for _ in range(count)]
+
+
+def generate_many(count, clues=30, processes=None, seed=None, chunksize=16):
+    """Generate puzzles with a pool of worker processes
+
+    Parameters
+    ----------
+    count(int)
+        the number of puzzles to generate
+
+    clues(int)
+        the number of clues of every puzzle
+
+    processes(int or None)
+        the number of worker processes (all cores when None); 1 generates the
+        puzzles in this process
+
+    seed(int or None)
+        the seed of the run; every chunk of puzzles gets its own seed drawn
+        from it, so a seeded run is reproducible for a given chunksize
+
+    chunksize(int)
+        the number of puzzles generated by a worker at a time
+
+    Returns
+    -------
+    generator
+        strings representing sudoku grids
+    """
+    rng = random.Random(seed)
+    tasks = []
+    while count > 0:
+        tasks.append((min(count, chunksize), clues, rng.getrandbits(64)))
+        count -= chunksize
+
+    processes = processes or cpu_count()
+    if processes == 1:
+        for task in tasks:
+            for puzzle in generate_chunk(task):
+                yield puzzle
+        return
+
+    with Pool(processes) as pool:
+        for chunk in pool.imap(generate_chunk, tasks):
+            for puzzle in chunk:
+                yield puzzle
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate diagonal Sudoku puzzles with unique solutions.")
+    parser.add_argument('-n', '--count', type=int, default=100,
+                        help="number of puzzles to generate")
+    parser.add_argument('-c', '--clues', type=int, default=30,
+                        help="number of clues of every puzzle")
+    parser.add_argument('-p', '--processes', type=int, default=None,
+                        help="number of worker processes (default: all cores)")
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help="random seed, for reproducible runs")
+    parser.add_argument('--chunksize', type=int, default=16,
+                        help="number of puzzles generated by a worker at a time")
+    parser.add_argument('-o', '--output', default='-',
+                        help="file to write the puzzles to ('-' for stdout)")
+    args = parser.parse_args()
+
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for puzzle in generate_many(args.count, args.clues, args.processes, args.seed, args.chunksize):
+            outfile.write(puzzle + "\n")
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
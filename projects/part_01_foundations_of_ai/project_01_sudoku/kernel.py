@@ -0,0 +1,246 @@
+"""Compiled propagation and search kernel for the bitmask engine (optional Numba).
+
+The functions below are the eliminate, only choice and naked twins strategies
+and the depth first search of bitmask.py, written over NumPy arrays in the
+subset of Python that Numba compiles: the board is an int64 array of candidate
+masks, the topology is flattened into padded index tables, and the search keeps
+its own stack of boards instead of recursing. Every step, including the MRV
+box choice and the order in which candidates are tried, mirrors bitmask.py, so
+both engines return the same solution after the same number of search nodes.
+Only the propagation passes differ: the kernel sweeps the whole board on every
+pass, while bitmask.py works through queues of changed cells and units.
+
+Numba (and NumPy) are optional. When they are not installed, `solve` falls
+back to `bitmask.search`, which gives identical results in pure Python.
+"""
+import bitmask
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = njit = None
+
+
+def jit(function):
+    """Compile a kernel function with Numba when it is available"""
+    if njit is None:
+        return function
+    return njit(cache=True)(function)
+
+
+def popcount(mask):
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+
+popcount = jit(popcount)
+
+
+@jit
+def eliminate(cells, peers, n_peers, full):
+    for i in range(cells.shape[0]):
+        mask = cells[i]
+        if mask != 0 and mask & (mask - 1) == 0:
+            keep = full ^ mask
+            for k in range(n_peers[i]):
+                cells[peers[i, k]] &= keep
+
+
+@jit
+def only_choice(cells, units, full):
+    """Return False if some unit cannot place every digit"""
+    for u in range(units.shape[0]):
+        once = 0
+        twice = 0
+        for k in range(units.shape[1]):
+            mask = cells[units[u, k]]
+            twice |= once & mask
+            once |= mask
+        if once != full:
+            return False
+        singles = once & ~twice
+        if singles == 0:
+            continue
+        for k in range(units.shape[1]):
+            i = units[u, k]
+            mask = cells[i] & singles
+            if mask != 0:
+                if mask & (mask - 1) != 0:
+                    return False
+                cells[i] = mask
+    return True
+
+
+@jit
+def naked_twins(cells, units, full):
+    size = units.shape[1]
+    seen_mask = np.zeros(size, dtype=np.int64)
+    seen_box = np.zeros(size, dtype=np.int64)
+    for u in range(units.shape[0]):
+        n_seen = 0
+        for k in range(size):
+            i = units[u, k]
+            mask = cells[i]
+            if popcount(mask) != 2:
+                continue
+            twin = -1
+            for s in range(n_seen):
+                if seen_mask[s] == mask:
+                    twin = seen_box[s]
+                    break
+            if twin < 0:
+                seen_mask[n_seen] = mask
+                seen_box[n_seen] = i
+                n_seen += 1
+                continue
+            keep = full ^ mask
+            for l in range(size):
+                j = units[u, l]
+                if j != i and j != twin:
+                    cells[j] &= keep
+
+
+@jit
+def reduce_puzzle(cells, peers, n_peers, units, full, counters):
+    """Return False if the puzzle is unsolvable, else reduce the cells in place;
+    counters[3] counts the propagation passes"""
+    before = np.empty_like(cells)
+    while True:
+        before[:] = cells
+        counters[3] += 1
+        eliminate(cells, peers, n_peers, full)
+        if not only_choice(cells, units, full):
+            return False
+        naked_twins(cells, units, full)
+
+        for i in range(cells.shape[0]):
+            if cells[i] == 0:
+                return False
+        if np.array_equal(cells, before):
+            return True
+
+
+@jit
+def choose_box(cells):
+    """Return the unsolved box with the fewest candidates (-1 if the board is solved)"""
+    best = -1
+    best_count = 0
+    for i in range(cells.shape[0]):
+        count = popcount(cells[i])
+        if count > 1 and (best < 0 or count < best_count):
+            best = i
+            best_count = count
+    return best
+
+
+@jit
+def search(cells, peers, n_peers, units, full, counters):
+    """Depth first search from `cells`, with an explicit stack of boards
+
+    Returns
+    -------
+    int64 array or None
+        The solved cells, or None if no solution exists. counters[0] counts
+        the nodes, counters[1] the backtracks, counters[2] the max depth and
+        counters[3] the propagation passes.
+    """
+    n_cells = cells.shape[0]
+    boards = np.empty((n_cells + 1, n_cells), dtype=np.int64)
+    box_at = np.empty(n_cells + 1, dtype=np.int64)
+    remaining = np.zeros(n_cells + 1, dtype=np.int64)
+    boards[0] = cells
+
+    depth = 0
+    counters[0] += 1
+    if not reduce_puzzle(boards[0], peers, n_peers, units, full, counters):
+        return None
+    box_at[0] = choose_box(boards[0])
+    if box_at[0] < 0:
+        return boards[0].copy()
+    remaining[0] = boards[0, box_at[0]]
+
+    while depth >= 0:
+        if remaining[depth] == 0:
+            # Every candidate of this node failed
+            if depth > 0:
+                counters[1] += 1
+            depth -= 1
+            continue
+
+        bit = remaining[depth] & -remaining[depth]
+        remaining[depth] ^= bit
+        child = depth + 1
+        boards[child] = boards[depth]
+        boards[child, box_at[depth]] = bit
+
+        counters[0] += 1
+        if child > counters[2]:
+            counters[2] = child
+        if not reduce_puzzle(boards[child], peers, n_peers, units, full, counters):
+            counters[1] += 1
+            continue
+        box_at[child] = choose_box(boards[child])
+        if box_at[child] < 0:
+            return boards[child].copy()
+        remaining[child] = boards[child, box_at[child]]
+        depth = child
+
+    return None
+
+
+_tables = {}
+
+
+def kernel_tables(topology):
+    """Return the (peers, n_peers, units, full) arrays of a topology, cached"""
+    if topology not in _tables:
+        width = max(len(p) for p in topology.peers)
+        peers = np.zeros((topology.n_cells, width), dtype=np.int64)
+        n_peers = np.zeros(topology.n_cells, dtype=np.int64)
+        for i, p in enumerate(topology.peers):
+            peers[i, :len(p)] = p
+            n_peers[i] = len(p)
+        units = np.array(topology.units, dtype=np.int64)
+        _tables[topology] = (peers, n_peers, units, np.int64(topology.all))
+    return _tables[topology]
+
+
+def solve(grid, stats=None, topology=bitmask.DEFAULT):
+    """Find the solution to a Sudoku puzzle with the compiled kernel
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) of the search nodes,
+        backtracks, maximum depth and propagation passes, see profiling.py
+
+    topology(SudokuTopology)
+        the board to solve, the 9x9 diagonal board by default
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    if njit is None:
+        return bitmask.solve(grid, stats, topology)
+
+    counters = np.zeros(4, dtype=np.int64)
+    cells = np.array(topology.grid2cells(grid), dtype=np.int64)
+    peers, n_peers, units, full = kernel_tables(topology)
+    solved = search(cells, peers, n_peers, units, full, counters)
+    if stats is not None:
+        stats['nodes'] += int(counters[0])
+        stats['backtracks'] += int(counters[1])
+        stats['max_depth'] = max(stats['max_depth'], int(counters[2]))
+        stats['passes'] += int(counters[3])
+    if solved is None:
+        return False
+    return topology.cells2values([int(mask) for mask in solved])
@@ -69,10 +69,11 @@ class SudokuSquare:
         self.yLoc = yLoc
         self.offsetX = offsetX
         self.offsetY = offsetY
+        self.rect = Rect(offsetX, offsetY, 45, 40)
 
     def draw(self):
         screen = pygame.display.get_surface()
-        AAfilledRoundedRect(screen, (self.offsetX, self.offsetY, 45, 40), self.color)
+        AAfilledRoundedRect(screen, self.rect, self.color)
 
         # screen.blit(self.collide, self.collideRect)
         screen.blit(self.text, self.textpos)
@@ -111,5 +112,16 @@ class SudokuSquare:
             return 1
 
 
+    def set_number(self, number):
+        """Show a new number (None for an empty square), whatever the edit mode"""
+        if number != None:
+            self.color = (2, 204, 186)
+            number = str(number)
+        else:
+            self.color = (255, 255, 255)
+            number = ""
+        self.text = self.font.render(number, 1, (255, 255, 255))
+
+
     def currentLoc(self):
         return self.xLoc, self.yLoc
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""Speculative parallel depth first search for single hard puzzles.
+
+The bitmask engine explores the branches of the MRV box one after another. Here
+the top levels of the search tree are expanded in this process, with constraint
+propagation at every node, until there are at least as many open branches as
+worker processes, and the subtrees are handed to a pool of workers. As soon as
+one worker returns a solution the other branches are cancelled.
+
+The pool is started on the first solve and kept for the next ones (see
+`get_pool`), so a solve does not pay for starting processes. Cancelling goes
+through a counter shared with the workers: every task carries the value of the
+counter when it was queued, the solve bumps the counter when it returns, and a
+worker gives its branch up at the next search node once the values differ.
+
+Only the candidate masks and the (n, diagonal) key of the topology travel to the
+workers, so any board supported by the bitmask engine can be solved this way.
+"""
+import atexit
+
+from collections import Counter
+from multiprocessing import Pool, RawValue, cpu_count
+
+import bitmask
+from topology import get_topology
+
+
+# The number of levels expanded at most before handing the branches out
+MAX_SPLIT_DEPTH = 8
+
+_pool = None
+_pool_processes = None
+# The solve counter shared with the workers, see the module docstring
+_generation = None
+
+
+class Cancelled(Exception):
+    """Raised in a worker whose solve has returned"""
+
+
+def init_worker(generation):
+    global _generation
+    _generation = generation
+
+
+def get_pool(processes):
+    """Return the pool of `processes` workers, starting it on first use or
+    when the number of processes changes"""
+    global _pool, _pool_processes, _generation
+    if _pool is None or _pool_processes != processes:
+        close()
+        _generation = RawValue('l', 0)
+        _pool = Pool(processes, init_worker, (_generation,))
+        _pool_processes = processes
+    return _pool
+
+
+def close():
+    """Stop the worker processes"""
+    global _pool, _pool_processes
+    if _pool is not None:
+        _pool.terminate()
+        _pool = _pool_processes = None
+
+
+atexit.register(close)
+
+
+def expand(cells, topology, depth, stats=None):
+    """Expand the first `depth` levels of the search tree
+
+    Returns
+    -------
+    (list, list or False)
+        The open branches (lists of candidate masks, in the order the
+        sequential search would visit them) and the solved cells if the
+        expansion itself completed the board, else False
+    """
+    if stats is not None:
+        stats['nodes'] += 1
+
+    cells = bitmask.reduce_puzzle(cells, topology)
+    if cells is False:
+        return [], False
+
+    popcount = topology.popcount
+    unsolved = [(popcount(mask), i) for i, mask in enumerate(cells) if popcount(mask) > 1]
+    if not unsolved:
+        return [], cells
+
+    count, i = min(unsolved)
+    branches = []
+    for bit in bitmask.iter_bits(cells[i]):
+        new_cells = cells[:]
+        new_cells[i] = bit
+        if depth <= 1:
+            branches.append(new_cells)
+            continue
+        sub_branches, solved = expand(new_cells, topology, depth - 1, stats)
+        if solved is not False:
+            return [], solved
+        branches.extend(sub_branches)
+    return branches, False
+
+
+def split(cells, topology, target, depth=None, stats=None):
+    """Expand the search tree level by level until there are at least `target`
+    open branches, or for exactly `depth` levels when it is given
+
+    Returns
+    -------
+    (list, list or False)
+        The open branches and the solved cells if the expansion itself
+        completed the board, else False (see `expand`)
+    """
+    branches = [cells]
+    level = 0
+    while branches and (len(branches) < target if depth is None else level < depth):
+        if level == MAX_SPLIT_DEPTH:
+            break
+        next_branches = []
+        for branch in branches:
+            sub_branches, solved = expand(branch, topology, 1, stats)
+            if solved is not False:
+                return [], solved
+            next_branches.extend(sub_branches)
+        branches = next_branches
+        level += 1
+    return branches, False
+
+
+def search_branch(args):
+    """Worker entry point: search one branch, returning (cells or False, nodes)"""
+    cells, n, diagonal, generation = args
+    stats = Counter()
+
+    def order(bits):
+        # Called at every branching node: give up once the solve has returned
+        if _generation.value != generation:
+            raise Cancelled()
+        return bits
+
+    try:
+        cells = bitmask.search(cells, stats, get_topology(n, diagonal), order=order)
+    except Cancelled:
+        cells = False
+    return cells, stats['nodes']
+
+
+def solve(grid, stats=None, topology=bitmask.DEFAULT, processes=None, depth=None):
+    """Find the solution to a Sudoku puzzle, searching branches in parallel
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) whose 'nodes' entry is
+        incremented for every search node visited by this process and by the
+        workers that finished before the solution was found
+
+    topology(SudokuTopology)
+        the board to solve, the 9x9 diagonal board by default
+
+    processes(int or None)
+        the number of worker processes (all cores when None)
+
+    depth(int or None)
+        the number of search levels expanded before handing the branches out;
+        by default, as many as needed for one branch per process (at most
+        MAX_SPLIT_DEPTH)
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    processes = processes or cpu_count()
+    branches, cells = split(topology.grid2cells(grid), topology, processes, depth, stats)
+    if cells is not False:
+        return topology.cells2values(cells)
+    if not branches:
+        return False
+
+    pool = get_pool(processes)
+    generation = _generation.value
+    tasks = [(branch, topology.n, topology.diagonal, generation) for branch in branches]
+    try:
+        for cells, nodes in pool.imap_unordered(search_branch, tasks):
+            if stats is not None:
+                stats['nodes'] += nodes
+            if cells is not False:
+                return topology.cells2values(cells)
+    finally:
+        # Cancel the branches still running or queued
+        _generation.value += 1
+    return False
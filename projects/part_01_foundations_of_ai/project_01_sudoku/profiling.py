@@ -0,0 +1,78 @@
+"""Instrumentation of the Sudoku solving engines.
+
+Every engine accepts a `stats` counter (e.g. collections.Counter) in which it
+counts search nodes, backtracks, the search depth and propagation passes.
+Passing a `SolverStats` instead also measures the propagation strategies:
+
+    nodes        search nodes visited
+    backtracks   search branches that failed
+    max_depth    deepest search level reached (the root is level 0)
+    passes       iterations of the propagation loops
+    calls, eliminated, seconds
+                 per strategy: the number of times it ran, the candidates it
+                 removed and the time spent in it
+
+With stats left to None the engines only pay for a few `is None` tests and one
+extra function call per strategy run.
+"""
+import timeit
+
+from collections import Counter
+
+
+def count_candidates(board):
+    """Return the number of candidates left on a board, in dictionary form or as
+    a list of candidate masks"""
+    if isinstance(board, dict):
+        return sum(len(value) for value in board.values())
+    return sum(bin(mask).count('1') for mask in board)
+
+
+def call_strategy(name, function, board, *args):
+    """Run a strategy without measuring it"""
+    return function(board, *args)
+
+
+class SolverStats(Counter):
+    """The counters of one or more solves (see the module docstring)"""
+
+    def __init__(self):
+        super(SolverStats, self).__init__()
+        self.calls = Counter()
+        self.eliminated = Counter()
+        self.seconds = Counter()
+
+    def run(self, name, function, board, *args):
+        """Run a strategy that changes `board` in place, measuring its time and
+        the candidates it removed"""
+        before = count_candidates(board)
+        start = timeit.default_timer()
+        result = function(board, *args)
+        self.seconds[name] += timeit.default_timer() - start
+        self.calls[name] += 1
+        self.eliminated[name] += before - count_candidates(board)
+        return result
+
+    def as_dict(self):
+        """Return the counters as a flat dictionary, e.g. for a metrics pipeline
+
+        Returns
+        -------
+        dict
+            'nodes', 'backtracks', 'max_depth' and 'passes', and for every
+            strategy '<name>.calls', '<name>.eliminated' and '<name>.seconds'
+        """
+        flat = dict((key, self[key]) for key in ('nodes', 'backtracks', 'max_depth', 'passes'))
+        for name in self.calls:
+            flat[name + '.calls'] = self.calls[name]
+            flat[name + '.eliminated'] = self.eliminated[name]
+            flat[name + '.seconds'] = self.seconds[name]
+        return flat
+
+
+def strategy_runner(stats):
+    """Return the function the engines call strategies through: `stats.run` when
+    profiling, else a plain call"""
+    if isinstance(stats, SolverStats):
+        return stats.run
+    return call_strategy
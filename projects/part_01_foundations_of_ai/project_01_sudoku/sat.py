@@ -0,0 +1,259 @@
+"""SAT backend: a CNF encoding of Sudoku and a watched-literal DPLL solver.
+
+Every (box, digit) pair is a boolean variable, numbered from 1 as
+box * size + digit + 1, and a board topology (see topology.py) is encoded as:
+
+    every box holds at least one digit, and at most one
+    every unit (rows, columns, squares and, on diagonal boards, the two
+    diagonals) holds every digit at least once, and at most once
+    every given digit is a unit clause
+
+Clauses are lists of integer literals (v for "v is true", -v for "v is
+false"), as in DIMACS. The solver is a plain DPLL with chronological
+backtracking. Unit propagation uses two watched literals per clause, and it
+branches on the shortest open clause of more than two literals, which for
+Sudoku is the box or unit digit with the fewest places left.
+"""
+from itertools import combinations
+
+from topology import get_topology
+
+
+DEFAULT = get_topology(3, diagonal=True)
+
+
+def variable(topology, i, d):
+    """Return the variable of digit index `d` in box `i`"""
+    return i * topology.size + d + 1
+
+
+_encodings = {}
+
+
+def encode_board(topology=DEFAULT):
+    """Return the clauses of the empty board, cached per topology"""
+    if topology not in _encodings:
+        size = topology.size
+        digits = range(size)
+        clauses = []
+        for i in range(topology.n_cells):
+            clauses.append([variable(topology, i, d) for d in digits])
+            clauses.extend([-variable(topology, i, d), -variable(topology, i, e)]
+                           for d, e in combinations(digits, 2))
+        for unit in topology.units:
+            for d in digits:
+                clauses.append([variable(topology, i, d) for i in unit])
+                clauses.extend([-variable(topology, i, d), -variable(topology, j, d)]
+                               for i, j in combinations(unit, 2))
+        _encodings[topology] = clauses
+    return _encodings[topology]
+
+
+def encode(grid, topology=DEFAULT):
+    """Encode a puzzle as CNF
+
+    Returns
+    -------
+    (int, list)
+        The number of variables and the list of clauses
+    """
+    clauses = [list(clause) for clause in encode_board(topology)]
+    symbols = topology.symbols
+    for i, val in enumerate(grid):
+        if val != '.':
+            clauses.append([variable(topology, i, symbols.index(val))])
+    return topology.n_cells * topology.size, clauses
+
+
+def decode(model, topology=DEFAULT):
+    """Convert a model (the list of true/false values by variable) into the
+    dictionary board representation"""
+    values = {}
+    for i, box in enumerate(topology.boxes):
+        values[box] = ''.join(s for d, s in enumerate(topology.symbols) if model[variable(topology, i, d)] > 0)
+    return values
+
+
+class DPLL(object):
+    """DPLL search with two watched literals per clause
+
+    Parameters
+    ----------
+    n_vars(int)
+        the number of variables, numbered from 1
+
+    clauses(list)
+        lists of integer literals; the clauses are reordered in place
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) of the decisions
+        ('nodes'), backtracks and maximum decision depth
+    """
+
+    def __init__(self, n_vars, clauses, stats=None):
+        self.n_vars = n_vars
+        self.clauses = clauses
+        self.stats = stats
+        self.value = [0] * (n_vars + 1)     # 1 true, -1 false, 0 unassigned
+        self.trail = []                     # the assigned literals, in order
+        self.head = 0                       # the next trail literal to propagate
+        self.watches = dict((lit, []) for v in range(1, n_vars + 1) for lit in (v, -v))
+        self.long_clauses = [c for c, clause in enumerate(clauses) if len(clause) > 2]
+        self.consistent = True
+
+        for c, clause in enumerate(clauses):
+            if not clause:
+                self.consistent = False
+            elif len(clause) == 1:
+                if not self.assign(clause[0]):
+                    self.consistent = False
+            else:
+                self.watches[clause[0]].append(c)
+                self.watches[clause[1]].append(c)
+
+    def lit_value(self, lit):
+        value = self.value[abs(lit)]
+        return value if lit > 0 else -value
+
+    def assign(self, lit):
+        """Make `lit` true; return False if it is already false"""
+        current = self.lit_value(lit)
+        if current:
+            return current > 0
+        self.value[abs(lit)] = 1 if lit > 0 else -1
+        self.trail.append(lit)
+        return True
+
+    def propagate(self):
+        """Propagate the trail with the watched literals; return False on a conflict"""
+        clauses, watches, value = self.clauses, self.watches, self.value
+        while self.head < len(self.trail):
+            false_lit = -self.trail[self.head]
+            self.head += 1
+            watching = watches[false_lit]
+            k = 0
+            while k < len(watching):
+                c = watching[k]
+                clause = clauses[c]
+                # Keep the false watch in position 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                other = clause[0]
+                other_value = value[abs(other)] if other > 0 else -value[abs(other)]
+                if other_value > 0:
+                    k += 1
+                    continue
+
+                # Look for a literal that is not false to watch instead
+                for j in range(2, len(clause)):
+                    lit = clause[j]
+                    if (value[abs(lit)] if lit > 0 else -value[abs(lit)]) >= 0:
+                        clause[1], clause[j] = lit, false_lit
+                        watches[lit].append(c)
+                        watching[k] = watching[-1]
+                        watching.pop()
+                        break
+                else:
+                    if other_value < 0:
+                        return False
+                    self.assign(other)
+                    k += 1
+        return True
+
+    def undo(self, position):
+        """Unassign every literal assigned after trail `position`"""
+        for lit in self.trail[position:]:
+            self.value[abs(lit)] = 0
+        del self.trail[position:]
+        self.head = position
+
+    def choose(self):
+        """Return an unassigned literal of the shortest open clause of more
+        than two literals, or of the first unassigned variable, or None if
+        every variable is assigned"""
+        best, best_open = None, 0
+        for c in self.long_clauses:
+            first, n_open = None, 0
+            for lit in self.clauses[c]:
+                lit_value = self.lit_value(lit)
+                if lit_value > 0:
+                    break
+                if lit_value == 0:
+                    n_open += 1
+                    if first is None:
+                        first = lit
+            else:
+                if first is not None and (best is None or n_open < best_open):
+                    best, best_open = first, n_open
+                    if n_open == 2:
+                        break
+        if best is not None:
+            return best
+        for v in range(1, self.n_vars + 1):
+            if not self.value[v]:
+                return v
+        return None
+
+    def solve(self):
+        """Search for a model
+
+        Returns
+        -------
+        list or False
+            The value (1 or -1) of every variable, indexed from 1, or False if
+            the clauses are unsatisfiable
+        """
+        stats = self.stats
+        if not self.consistent or not self.propagate():
+            return False
+
+        decisions = []      # (trail position, literal, whether it is the second branch)
+        while True:
+            lit = self.choose()
+            if lit is None:
+                return list(self.value)
+            decisions.append((len(self.trail), lit, False))
+            if stats is not None:
+                stats['nodes'] += 1
+                if len(decisions) > stats['max_depth']:
+                    stats['max_depth'] = len(decisions)
+            self.assign(lit)
+
+            while not self.propagate():
+                if stats is not None:
+                    stats['backtracks'] += 1
+                while decisions and decisions[-1][2]:
+                    decisions.pop()
+                if not decisions:
+                    return False
+                position, lit, _ = decisions.pop()
+                self.undo(position)
+                decisions.append((position, -lit, True))
+                self.assign(-lit)
+
+
+def solve(grid, stats=None, topology=DEFAULT):
+    """Find the solution to a Sudoku puzzle with the SAT backend
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) of the decisions
+        ('nodes'), backtracks and maximum decision depth
+
+    topology(SudokuTopology)
+        the board to solve, the 9x9 diagonal board by default
+
+    Returns
+    -------
+    dict or False
+        The dictionary representation of the final sudoku grid or False if no solution exists.
+    """
+    n_vars, clauses = encode(grid, topology)
+    model = DPLL(n_vars, clauses, stats).solve()
+    if model is False:
+        return False
+    return decode(model, topology)
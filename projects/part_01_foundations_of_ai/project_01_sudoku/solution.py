@@ -1,21 +1,24 @@
 
-from utils import *
-
+from collections import deque
+from itertools import combinations
+from threading import Thread
 
-cols_rvrs = cols[::-1]
+from profiling import SolverStats, strategy_runner
+from topology import topology_for_grid
+from utils import *
 
-row_units = [cross(r, cols) for r in rows]
-column_units = [cross(rows, c) for c in cols]
-square_units = [cross(rs, cs) for rs in ('ABC','DEF','GHI') for cs in ('123','456','789')]
-unitlist = row_units + column_units + square_units
 
-# Update the unit list to add the new diagonal units
-diag_units = [[rows[i]+cols[i] for i in range(len(rows))],
-              [rows[i]+cols_rvrs[i] for i in range(len(rows))]]
-unitlist += diag_units
+# The rows, columns, squares and the two diagonal units of the 9x9 board, built
+# from the cached board topology (see topology.py)
+unitlist = topology.unitlist
+row_units = unitlist[:9]
+column_units = unitlist[9:18]
+square_units = unitlist[18:27]
+diag_units = unitlist[27:]
 
-units = dict((box, [unit for unit in unitlist if box in unit]) for box in boxes)
-peers = dict((box, set(sum(units[box],[]))-set([box])) for box in boxes)
+units = topology.box_units()
+peers = topology.box_peers()
+unit_ids = dict((box, list(topology.cell_units[i])) for i, box in enumerate(boxes))
 
 
 def naked_twins(values):
@@ -46,22 +49,85 @@ def naked_twins(values):
     strategy repeatedly).
     """
  
-    twin_candidates = [box for box in values.keys() if len(values[box]) == 2]
-    
-    naked_twins = [[box, peer] for box in twin_candidates for peer in peers[box] \
-                   if values[box] == values[peer]]
-    
-    for naked_twin in naked_twins:
-        box1 = naked_twin[0]
-        box2 = naked_twin[1]
-        twin_val = values[box1]
-        common_peers = set(peers[box1]).intersection(set(peers[box2]))
-        
-        for peer in common_peers:
-            for v in twin_val:
-                if v in values[peer]:
-                    values = assign_value(values, peer, values[peer].replace(v,''))
-   
+    return naked_subsets(values, 2)
+
+
+def find_naked_subsets(values, unit, size=2):
+    """Find the naked subsets of a unit: `size` boxes whose candidates together
+    hold exactly `size` digits (naked twins for 2, triples for 3, quads for 4).
+
+    The boxes with 2 to `size` candidates are indexed by their candidate string,
+    so boxes with identical candidates are grouped in a single pass. Naked twins
+    are then the strings shared by two boxes; for triples and quads the
+    distinct candidate strings are combined with each other.
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    unit(list)
+        the boxes of one unit
+
+    size(int)
+        the number of boxes (and digits) in a subset
+
+    Returns
+    -------
+    list
+        a list of (digits, boxes) pairs, one for each naked subset in the unit
+    """
+
+    index = {}
+    for box in unit:
+        if 2 <= len(values[box]) <= size:
+            index.setdefault(values[box], []).append(box)
+
+    if size == 2:
+        return [(digits, twin_boxes) for digits, twin_boxes in index.items() if len(twin_boxes) == 2]
+
+    subsets = []
+    keys = list(index)
+    for n_keys in range(1, size + 1):
+        for combo in combinations(keys, n_keys):
+            digits = ''.join(sorted(set(''.join(combo))))
+            subset_boxes = [box for key in combo for box in index[key]]
+            if len(digits) == size and len(subset_boxes) == size:
+                subsets.append((digits, subset_boxes))
+
+    return subsets
+
+
+def naked_subsets(values, size=2):
+    """Eliminate values using the naked subsets strategy for subsets of `size`
+    boxes. All the subsets of the input are found before any candidate is
+    removed.
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    size(int)
+        2 for naked twins, 3 for naked triples, 4 for naked quads
+
+    Returns
+    -------
+    dict
+        The values dictionary with the naked subsets eliminated from their units
+    """
+
+    subsets = [(unit, digits, subset_boxes) for unit in unitlist
+               for digits, subset_boxes in find_naked_subsets(values, unit, size)]
+
+    for unit, digits, subset_boxes in subsets:
+        for box in unit:
+            if box in subset_boxes:
+                continue
+            for v in digits:
+                if v in values[box]:
+                    values = assign_value(values, box, values[box].replace(v, ''))
+
     return values
 
 
@@ -126,14 +192,75 @@ def only_choice(values):
     return values
 
 
-def reduce_puzzle(values):
+def only_choice_unit(values, unit):
+    """Apply the only choice strategy to a single unit
+
+    Returns
+    -------
+    list or False
+        The boxes whose values were changed, or False if a digit has no
+        possible place left in the unit
+    """
+
+    changed = []
+    for digit in '123456789':
+        dplaces = [box for box in unit if digit in values[box]]
+
+        if not dplaces:
+            return False
+        if len(dplaces) == 1 and values[dplaces[0]] != digit:
+            assign_value(values, dplaces[0], digit)
+            changed.append(dplaces[0])
+
+    return changed
+
+
+def naked_subsets_unit(values, unit, size=2):
+    """Apply the naked subsets strategy to a single unit, removing the candidates
+    of every naked subset from the other boxes of the unit
+
+    Returns
+    -------
+    list or False
+        The boxes whose values were changed, or False if a box ran out of
+        candidates
+    """
+
+    changed = []
+    for digits, subset_boxes in find_naked_subsets(values, unit, size):
+        for box in unit:
+            if box in subset_boxes:
+                continue
+            remaining = values[box]
+            for v in digits:
+                remaining = remaining.replace(v, '')
+            if remaining != values[box]:
+                if not remaining:
+                    return False
+                assign_value(values, box, remaining)
+                changed.append(box)
+
+    return changed
+
+
+def reduce_puzzle(values, stats=None):
     """Reduce a Sudoku puzzle by repeatedly applying all constraint strategies
 
+    Propagation is driven by two work queues: solved boxes whose digit still has
+    to be eliminated from their peers, and units containing a box that changed,
+    which are re-checked with the only choice and naked twins strategies. Each
+    step only touches the boxes affected by earlier changes, and the puzzle is
+    rejected as soon as a box or a unit runs out of candidates.
+
     Parameters
     ----------
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    stats(dict or None)
+        if given, a counter whose 'passes' entry counts the iterations of the
+        propagation loop; a profiling.SolverStats also measures every strategy
+
     Returns
     -------
     dict or False
@@ -141,26 +268,62 @@ def reduce_puzzle(values):
         no longer produces any changes, or False if the puzzle is unsolvable 
     """
     
-    stalled = False
-    
-    while not stalled:
-        num_solved_boxes_before = len([box for box in values.keys() if len(values[box]) == 1])
+    if any(len(values[box]) == 0 for box in boxes):
+        return False
+
+    solved = deque(box for box in boxes if len(values[box]) == 1)
+    dirty = deque(range(len(unitlist)))
+    queued = set(dirty)
+
+    def mark_changed(boxes_changed):
+        for box in boxes_changed:
+            if len(values[box]) == 1:
+                solved.append(box)
+            for i in unit_ids[box]:
+                if i not in queued:
+                    queued.add(i)
+                    dirty.append(i)
+
+    def eliminate_solved(values):
+        while solved:
+            box = solved.popleft()
+            digit = values[box]
+
+            for peer in peers[box]:
+                if digit in values[peer]:
+                    remaining = values[peer].replace(digit, '')
+                    if not remaining:
+                        return False
+                    assign_value(values, peer, remaining)
+                    mark_changed([peer])
+        return values
 
-        values = eliminate(values)
-        values = only_choice(values)
-        values = naked_twins(values)
+    run = strategy_runner(stats)
+    while solved or dirty:
+        if stats is not None:
+            stats['passes'] += 1
 
-        num_solved_boxes_after = len([box for box in values.keys() if len(values[box]) == 1])
-        
-        stalled = (num_solved_boxes_before == num_solved_boxes_after)
-        
-        if len([box for box in values.keys() if len(values[box]) == 0]):
+        if solved and run('eliminate', eliminate_solved, values) is False:
             return False
+
+        if dirty:
+            i = dirty.popleft()
+            queued.discard(i)
+
+            boxes_changed = run('only_choice', only_choice_unit, values, unitlist[i])
+            if boxes_changed is False:
+                return False
+            mark_changed(boxes_changed)
+
+            boxes_changed = run('naked_twins', naked_subsets_unit, values, unitlist[i], 2)
+            if boxes_changed is False:
+                return False
+            mark_changed(boxes_changed)
         
     return values
 
 
-def search(values):
+def search(values, stats=None, depth=0):
     """Apply depth first search to solve Sudoku puzzles in order to solve puzzles
     that cannot be solved by repeated reduction alone.
 
@@ -169,6 +332,13 @@ def search(values):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) of the search nodes,
+        backtracks and maximum depth, see profiling.py
+
+    depth(int)
+        the depth of this node in the search tree
+
     Returns
     -------
     dict or False
@@ -180,8 +350,13 @@ def search(values):
     and extending it to call the naked twins strategy.
     """
 
+    if stats is not None:
+        stats['nodes'] += 1
+        if depth > stats['max_depth']:
+            stats['max_depth'] = depth
+
     # First reduce the puzzle
-    values = reduce_puzzle(values)
+    values = reduce_puzzle(values, stats)
     
     if values is False:
         return False
@@ -194,18 +369,89 @@ def search(values):
     # Now use recursion to solve each one of the resulting sudokus, 
     # and if one returns a value (not False), return that answer!
     for v in values[box]:
+        mark = history_mark()
         new_values = values.copy()
-        new_values[box] = v
+        assign_value(new_values, box, v)
         
-        solved_values = search(new_values)
+        solved_values = search(new_values, stats, depth + 1)
         
         if solved_values is not False:
             return solved_values
+        if stats is not None:
+            stats['backtracks'] += 1
+
+        history_rewind(mark)
         
     return False
     
 
-def solve(grid):
+def search_trail(values, stats=None):
+    """Apply depth first search like `search`, but change a single board in place
+    and roll the changes of failed branches back instead of copying the board
+    for every candidate.
+
+    The changes are logged by `assign_value` on a trail installed for the
+    duration of the search (see `set_trail`).
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) of the search nodes,
+        backtracks and maximum depth, see profiling.py
+
+    Returns
+    -------
+    dict or False
+        The same values dictionary with all boxes assigned, or False (with the
+        board left as it was passed in)
+    """
+
+    previous = set_trail([])
+    try:
+        return _search_trail(values, stats, 0)
+    finally:
+        set_trail(previous)
+
+
+def _search_trail(values, stats, depth):
+    if stats is not None:
+        stats['nodes'] += 1
+        if depth > stats['max_depth']:
+            stats['max_depth'] = depth
+
+    mark = trail_mark()
+    history = history_mark()
+
+    if reduce_puzzle(values, stats) is False:
+        undo_trail(values, mark)
+        history_rewind(history)
+        return False
+    if all(len(values[box]) == 1 for box in boxes):
+        return values
+
+    # Choose one of the unfilled squares with the fewest possibilities
+    val_len, box = min((len(values[box]), box) for box in boxes if len(values[box]) > 1)
+
+    for v in values[box]:
+        branch = trail_mark()
+        assign_value(values, box, v)
+
+        if _search_trail(values, stats, depth + 1) is not False:
+            return values
+        if stats is not None:
+            stats['backtracks'] += 1
+
+        undo_trail(values, branch)
+
+    undo_trail(values, mark)
+    history_rewind(history)
+    return False
+
+
+def solve(grid, engine='search', stats=None, topology=None, cache=None):
     """Find the solution to a Sudoku puzzle using search and constraint propagation
 
     Parameters
@@ -215,17 +461,220 @@ def solve(grid):
         
         Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
 
+    engine(string)
+        the solving backend: 'search' for the dictionary engine in this module,
+        'trail' for the same engine searching one board in place with an undo
+        trail, 'bitmask' for the candidate bitmask engine in bitmask.py,
+        'strategies' for the bitmask engine with the advanced strategies of
+        strategies.py, 'parallel' for the bitmask engine with its top-level
+        branches searched by a pool of processes (see parallel.py), 'kernel'
+        for the bitmask engine compiled with Numba when it is installed (see
+        kernel.py), 'sat' for the CNF encoding and DPLL solver in sat.py, or
+        'dlx' for the dancing links exact cover engine in dlx.py
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) whose 'nodes' entry is
+        incremented for every search node visited
+
+    topology(SudokuTopology or None)
+        the board to solve (see topology.py). By default the diagonal board
+        matching the length of the grid; boards other than the 9x9 diagonal
+        one are only supported by the 'bitmask', 'strategies', 'parallel',
+        'kernel' and 'sat' engines.
+
+    cache(canonical.SolutionCache or None)
+        if given, the puzzle is first looked up by its canonical form, and the
+        solution found by the engine is stored on a miss (9x9 diagonal boards
+        only)
+
     Returns
     -------
     dict or False
         The dictionary representation of the final sudoku grid or False if no solution exists.
     """
     
+    if topology is None:
+        topology = topology_for_grid(grid)
+
+    if cache is not None:
+        if topology is not get_topology(3, diagonal=True):
+            raise ValueError("The solution cache only holds 9x9 diagonal Sudoku")
+        values = cache.lookup(grid)
+        if values is None:
+            values = solve(grid, engine, stats, topology)
+            cache.store(grid, values)
+        return values
+
+    # Keep only the assignments of this solve in the history
+    history_rewind(0)
+
+    if engine == 'bitmask':
+        import bitmask
+        return bitmask.solve(grid, stats, topology)
+    if engine == 'strategies':
+        import bitmask, strategies
+        return bitmask.solve(grid, stats, topology, strategies.pipeline)
+    if engine == 'parallel':
+        import parallel
+        return parallel.solve(grid, stats, topology)
+    if engine == 'kernel':
+        import kernel
+        return kernel.solve(grid, stats, topology)
+    if engine == 'sat':
+        import sat
+        return sat.solve(grid, stats, topology)
+    if topology is not get_topology(3, diagonal=True):
+        raise ValueError("The {} engine only solves 9x9 diagonal Sudoku, use engine='bitmask'".format(engine))
+    if engine == 'dlx':
+        import dlx
+        return dlx.solve(grid, stats)
+    if engine == 'trail':
+        return search_trail(grid2values(grid), stats)
+    if engine != 'search':
+        raise ValueError("Unknown engine: {}".format(engine))
+
     values = grid2values(grid)
-    values = search(values)
+    values = search(values, stats)
     return values
 
 
+def solve_steps(grid, engine='search', maxsize=64):
+    """Solve a puzzle in a background thread and yield its (box, value) steps
+    while the search runs, e.g. for the visualizer to replay without waiting
+    for the solve or holding its whole history
+
+    The steps follow the search, failed branches included (see
+    `utils.StepStream`). Only the dictionary engines ('search' and 'trail')
+    report their steps. The recorder is process-wide, so nothing else should
+    be solved until the generator is exhausted or closed.
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    engine(string)
+        'search' or 'trail', see `solve`
+
+    maxsize(int)
+        the number of steps the solver can run ahead of the consumer
+
+    Returns
+    -------
+    generator
+        (box, value) assignments, to apply in order to the starting puzzle;
+        an exception raised by the solve is raised again by the generator
+    """
+    if engine not in ('search', 'trail'):
+        raise ValueError("Only the 'search' and 'trail' engines report their steps")
+
+    stream = StepStream(grid2values(grid), maxsize)
+
+    def run():
+        # The last item is None once the solve is done, or the exception it
+        # raised, to re-raise in the consumer
+        end = None
+        previous = set_recorder(stream)
+        try:
+            solve(grid, engine)
+        except StreamClosed:
+            return
+        except BaseException as error:
+            end = error
+        finally:
+            set_recorder(previous)
+        try:
+            stream.put(end)
+        except StreamClosed:
+            pass
+
+    thread = Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            step = stream.queue.get()
+            if step is None:
+                return
+            if isinstance(step, BaseException):
+                raise step
+            yield step
+    finally:
+        stream.closed = True
+        thread.join()
+
+
+def solve_with_stats(grid, engine='search', topology=None):
+    """Solve a Sudoku puzzle like `solve`, with the full instrumentation on
+
+    Returns
+    -------
+    (dict or False, SolverStats)
+        The result of `solve` and the counters and strategy timings of the
+        solve (see profiling.py)
+    """
+    stats = SolverStats()
+    return solve(grid, engine, stats, topology), stats
+
+
+def solve_batch(grids):
+    """Find the solutions to many Sudoku puzzles at once with the vectorized
+    solver in batch.py (requires NumPy)
+
+    Parameters
+    ----------
+    grids(iterable)
+        strings representing sudoku grids.
+
+    Returns
+    -------
+    list
+        For each grid, the dictionary representation of the final sudoku grid
+        or False if no solution exists.
+    """
+
+    import batch
+    return batch.solve_batch(grids)
+
+
+def count_solutions(grid, limit=2, stats=None, topology=None):
+    """Count the solutions of a Sudoku puzzle with the bitmask propagation and
+    search, stopping as soon as `limit` solutions are found
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    limit(int or None)
+        the number of solutions after which counting stops, or None to count
+        them all
+
+    stats(dict or None)
+        if given, a counter (e.g. collections.Counter) whose 'nodes' entry is
+        incremented for every search node visited
+
+    topology(SudokuTopology or None)
+        the board to solve; by default the diagonal board matching the length
+        of the grid
+
+    Returns
+    -------
+    int
+        The number of solutions found (at most `limit`)
+    """
+
+    import bitmask
+    if topology is None:
+        topology = topology_for_grid(grid)
+    return bitmask.count_solutions(grid, limit, topology, stats)
+
+
+def is_unique(grid, topology=None):
+    """Return True if the Sudoku puzzle has exactly one solution"""
+    return count_solutions(grid, 2, topology=topology) == 1
+
+
 def values(grid):
     values = {}
     for v, k in zip(grid, boxes):
@@ -239,12 +688,13 @@ if __name__ == "__main__":
     diag_sudoku_grid = '........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.'
     display(values(diag_sudoku_grid))
     #display(grid2values(diag_sudoku_grid))
+    set_recorder(history)
     result = solve(diag_sudoku_grid)
     display(result)
     
     #try:
     #    import PySudoku
-    #    PySudoku.play(grid2values(diag_sudoku_grid), result, history)
+    #    PySudoku.play(grid2values(diag_sudoku_grid), history)
 
     #except SystemExit:
     #    pass
@@ -0,0 +1,236 @@
+"""Advanced constraint strategies and a pipeline that runs them by cost/benefit.
+
+The strategies work on the candidate masks of the bitmask engine (see
+bitmask.py) and remove candidates in place. Each one returns the number of
+candidates it eliminated:
+
+    hidden pairs / triples   n digits confined to the same n boxes of a unit
+    pointing                 a digit of a square confined to one line (row,
+                             column or diagonal) is removed from the rest of it
+    box-line reduction       a digit of a line confined to one square is
+                             removed from the rest of the square
+    x-wing                   a digit confined to the same two columns in two
+                             rows (or rows in two columns) is removed from the
+                             rest of those columns (rows)
+
+`StrategyPipeline` runs them whenever eliminate / only choice / naked twins
+stall, cheapest-per-elimination first, and keeps per-strategy counters.
+"""
+import timeit
+
+from functools import partial
+from itertools import combinations
+
+from profiling import strategy_runner
+
+
+def hidden_subsets(cells, topology, size=2):
+    """Restrict every group of `size` boxes that holds the only places of `size`
+    digits of a unit to those digits
+
+    Returns
+    -------
+    int
+        The number of candidates eliminated
+    """
+    popcount = topology.popcount
+    eliminated = 0
+
+    for unit in topology.units:
+        places = {}
+        for bit in topology.bits:
+            where = [i for i in unit if cells[i] & bit]
+            # Digits with a single place are left to the only choice strategy
+            if 2 <= len(where) <= size:
+                places[bit] = where
+        if len(places) < size:
+            continue
+
+        for combo in combinations(places, size):
+            cover = set()
+            for bit in combo:
+                cover.update(places[bit])
+            if len(cover) != size:
+                continue
+            keep = sum(combo)
+            for i in cover:
+                removed = cells[i] & ~keep
+                if removed:
+                    cells[i] &= keep
+                    eliminated += popcount(removed)
+
+    return eliminated
+
+
+_intersections = {}
+
+
+def intersections(topology):
+    """Return the (unit, intersection, rest of unit, rest of other unit) tuples of
+    every square and line (row, column or diagonal) sharing two or more boxes,
+    in both directions, cached per topology"""
+    if topology not in _intersections:
+        lines = topology.row_units + topology.column_units + topology.diag_units
+        pointing, box_line = [], []
+        for square in topology.square_units:
+            for line in lines:
+                inter = tuple(sorted(set(square) & set(line)))
+                if len(inter) < 2:
+                    continue
+                square_rest = tuple(i for i in square if i not in inter)
+                line_rest = tuple(i for i in line if i not in inter)
+                pointing.append((inter, square_rest, line_rest))
+                box_line.append((inter, line_rest, square_rest))
+        _intersections[topology] = (tuple(pointing), tuple(box_line))
+    return _intersections[topology]
+
+
+def intersection_removal(cells, topology, pairs):
+    """For each (intersection, rest of unit A, rest of unit B) of `pairs`, remove
+    the digits of unit A that only fit in the intersection from the rest of B
+
+    Returns
+    -------
+    int
+        The number of candidates eliminated
+    """
+    popcount = topology.popcount
+    eliminated = 0
+
+    for inter, a_rest, b_rest in pairs:
+        inside = outside = 0
+        for i in inter:
+            inside |= cells[i]
+        for i in a_rest:
+            outside |= cells[i]
+        confined = inside & ~outside
+        if not confined:
+            continue
+        for i in b_rest:
+            removed = cells[i] & confined
+            if removed:
+                cells[i] ^= removed
+                eliminated += popcount(removed)
+
+    return eliminated
+
+
+def pointing(cells, topology):
+    """Apply pointing pairs / triples (square to line)"""
+    return intersection_removal(cells, topology, intersections(topology)[0])
+
+
+def box_line_reduction(cells, topology):
+    """Apply box-line reduction (line to square)"""
+    return intersection_removal(cells, topology, intersections(topology)[1])
+
+
+def x_wing(cells, topology):
+    """Apply the x-wing strategy on rows and on columns
+
+    Returns
+    -------
+    int
+        The number of candidates eliminated
+    """
+    eliminated = 0
+
+    for lines, crosses in ((topology.row_units, topology.column_units),
+                           (topology.column_units, topology.row_units)):
+        for bit in topology.bits:
+            # For every line, the positions along it where the digit fits
+            pairs = {}
+            for l, line in enumerate(lines):
+                where = tuple(k for k, i in enumerate(line) if cells[i] & bit)
+                if len(where) == 2:
+                    pairs.setdefault(where, []).append(l)
+
+            for where, wing in pairs.items():
+                if len(wing) != 2:
+                    continue
+                for k in where:
+                    for l, i in enumerate(crosses[k]):
+                        if l not in wing and cells[i] & bit:
+                            cells[i] ^= bit
+                            eliminated += 1
+
+    return eliminated
+
+
+class Strategy(object):
+    """A named strategy with counters of its calls, eliminations and run time"""
+
+    def __init__(self, name, function):
+        self.name = name
+        self.function = function
+        self.calls = 0
+        self.eliminated = 0
+        self.seconds = 0.
+
+    def __call__(self, cells, topology):
+        start = timeit.default_timer()
+        eliminated = self.function(cells, topology)
+        self.seconds += timeit.default_timer() - start
+        self.calls += 1
+        self.eliminated += eliminated
+        return eliminated
+
+    def benefit(self):
+        """Candidates eliminated per second spent; untried strategies come first"""
+        if not self.calls:
+            return float('inf')
+        return self.eliminated / max(self.seconds, 1e-9)
+
+
+def default_strategies():
+    return [Strategy('hidden_pairs', partial(hidden_subsets, size=2)),
+            Strategy('hidden_triples', partial(hidden_subsets, size=3)),
+            Strategy('pointing', pointing),
+            Strategy('box_line_reduction', box_line_reduction),
+            Strategy('x_wing', x_wing)]
+
+
+class StrategyPipeline(object):
+    """Run a list of strategies, best cost/benefit first, until one prunes
+
+    Parameters
+    ----------
+    strategies : list (optional)
+        `Strategy` objects; the five strategies of this module by default.
+    """
+
+    def __init__(self, strategies=None):
+        self.strategies = strategies if strategies is not None else default_strategies()
+
+    def apply(self, cells, topology, stats=None):
+        """Apply the strategies in order until one of them eliminates candidates,
+        then reorder them by their observed benefit
+
+        Parameters
+        ----------
+        stats(profiling.SolverStats or None)
+            if given, the strategies are measured in it as well
+
+        Returns
+        -------
+        int
+            The number of candidates eliminated (0 if every strategy stalled)
+        """
+        run = strategy_runner(stats)
+        eliminated = 0
+        for strategy in self.strategies:
+            eliminated = run(strategy.name, strategy, cells, topology)
+            if eliminated:
+                break
+        self.strategies.sort(key=Strategy.benefit, reverse=True)
+        return eliminated
+
+    def report(self):
+        """Return the counters of every strategy, in the current order"""
+        return [{'name': s.name, 'calls': s.calls, 'eliminated': s.eliminated, 'seconds': s.seconds}
+                for s in self.strategies]
+
+
+# The pipeline used by solve(grid, engine='strategies'); its ordering adapts
+# across solves
+pipeline = StrategyPipeline()
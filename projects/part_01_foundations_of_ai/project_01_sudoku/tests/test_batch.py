@@ -0,0 +1,27 @@
+import unittest
+
+import solution
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "the batch solver requires NumPy")
+class TestSolveBatch(unittest.TestCase):
+    grids = ['2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3',
+             '...6..5.....5........2...87..9..1........5.............85.......7..3..5...1.5...9',
+             '........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.',
+             '22' + '.' * 79]
+
+    def test_solve_batch_matches_solve(self):
+        results = solution.solve_batch(self.grids)
+        self.assertEqual(results, [solution.solve(grid, engine='bitmask') for grid in self.grids])
+
+    def test_empty_batch(self):
+        self.assertEqual(solution.solve_batch([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_percentile(self):
+        data = list(range(1, 101))
+        self.assertEqual(benchmark.percentile(data, 50), 50)
+        self.assertEqual(benchmark.percentile(data, 99), 99)
+        self.assertEqual(benchmark.percentile([3.], 99), 3.)
+
+    def test_tiers_load(self):
+        for tier in benchmark.TIERS:
+            grids = benchmark.load_tier(tier)
+            self.assertTrue(grids)
+            self.assertTrue(all(len(grid) == 81 for grid in grids))
+
+    def test_run_engine(self):
+        row = benchmark.run_engine('bitmask', benchmark.load_tier('easy')[:3])
+        self.assertEqual(row['puzzles'], 3)
+        self.assertEqual(row['failures'], 0)
+        self.assertEqual(row['max_nodes'], 1)
+        self.assertGreater(row['peak_memory_bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
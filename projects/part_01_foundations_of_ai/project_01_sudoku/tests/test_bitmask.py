@@ -0,0 +1,75 @@
+import unittest
+
+import bitmask
+import solution
+from tests import test_solution
+from utils import grid2values
+
+
+class TestBitmaskAdapters(unittest.TestCase):
+    diagonal_grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    def test_round_trip(self):
+        cells = bitmask.grid2cells(self.diagonal_grid)
+        self.assertEqual(bitmask.cells2grid(cells), self.diagonal_grid)
+        self.assertEqual(bitmask.cells2values(cells), grid2values(self.diagonal_grid))
+        self.assertEqual(bitmask.values2cells(grid2values(self.diagonal_grid)), cells)
+
+
+class TestBitmaskEngine(unittest.TestCase):
+    grids = ['2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3',
+             '...6..5.....5........2...87..9..1........5.............85.......7..3..5...1.5...9',
+             '........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.']
+
+    def test_naked_twins(self):
+        before = test_solution.TestNakedTwins.before_naked_twins_1
+        cells = bitmask.naked_twins(bitmask.values2cells(before))
+        self.assertIn(bitmask.cells2values(cells), test_solution.TestNakedTwins.possible_solutions_1)
+
+    def test_reduce_matches_full_sweeps(self):
+        for grid in self.grids + ['12345678.' + '........9' + '.' * 63]:
+            cells = bitmask.grid2cells(grid)
+            while True:
+                before = cells[:]
+                cells = bitmask.only_choice(bitmask.eliminate(cells))
+                if cells is False:
+                    break
+                cells = bitmask.naked_twins(cells)
+                if 0 in cells:
+                    cells = False
+                    break
+                if cells == before:
+                    break
+            self.assertEqual(bitmask.reduce_puzzle(bitmask.grid2cells(grid)), cells)
+
+    def test_solve_matches_search(self):
+        for grid in self.grids:
+            self.assertEqual(solution.solve(grid, engine='bitmask'), solution.solve(grid))
+
+    def test_unsolvable(self):
+        grid = '22' + '.' * 79
+        self.assertIs(solution.solve(grid, engine='bitmask'), False)
+
+
+class TestCountSolutions(unittest.TestCase):
+
+    def test_unique(self):
+        grid = TestBitmaskEngine.grids[0]
+        self.assertEqual(solution.count_solutions(grid), 1)
+        self.assertTrue(solution.is_unique(grid))
+
+    def test_stops_at_limit(self):
+        self.assertEqual(solution.count_solutions('.' * 81, limit=2), 2)
+        self.assertFalse(solution.is_unique('.' * 81))
+
+    def test_count_all(self):
+        # Every 4x4 diagonal Sudoku
+        self.assertEqual(solution.count_solutions('.' * 16, limit=None), 48)
+
+    def test_unsolvable(self):
+        self.assertEqual(solution.count_solutions('22' + '.' * 79), 0)
+        self.assertFalse(solution.is_unique('22' + '.' * 79))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import random
+import unittest
+
+import benchmark
+import canonical
+import solution
+from utils import values2grid
+
+
+def transform(grid, t, digits):
+    """Apply a board symmetry and a digit relabelling to a grid"""
+    return ''.join(digits.get(grid[i], '.') for i in t)
+
+
+class TestCanonicalForm(unittest.TestCase):
+
+    def test_symmetries_keep_units(self):
+        units = set(frozenset(unit) for unit in solution.topology.units)
+        self.assertEqual(len(canonical.TRANSFORMS), 96)
+        for t in canonical.TRANSFORMS:
+            self.assertEqual(set(frozenset(t[i] for i in unit) for unit in units), units)
+
+    def test_equivalent_grids(self):
+        rng = random.Random(1)
+        grid = benchmark.load_tier('hard')[0]
+        for _ in range(5):
+            shuffled = list('123456789')
+            rng.shuffle(shuffled)
+            other = transform(grid, rng.choice(canonical.TRANSFORMS), dict(zip('123456789', shuffled)))
+            self.assertEqual(canonical.canonical_form(other)[0], canonical.canonical_form(grid)[0])
+
+    def test_round_trip(self):
+        grid = benchmark.load_tier('easy')[0]
+        solved = values2grid(solution.solve(grid, 'dlx'))
+        form, t, labels = canonical.canonical_form(grid)
+        self.assertEqual(canonical.from_canonical(canonical.to_canonical(solved, t, labels), t, labels), solved)
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = canonical.SolutionCache(':memory:')
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_equivalent_puzzle_hits(self):
+        grid = benchmark.load_tier('hard')[1]
+        self.assertEqual(solution.solve(grid, 'bitmask', cache=self.cache), solution.solve(grid, 'dlx'))
+        other = transform(grid, canonical.TRANSFORMS[-1], dict(zip('123456789', '918273645')))
+        self.assertEqual(solution.solve(other, 'bitmask', cache=self.cache), solution.solve(other, 'dlx'))
+        self.assertEqual((self.cache.hits, self.cache.misses, len(self.cache)), (1, 1, 1))
+
+    def test_no_solution(self):
+        grid = '22' + '.' * 79
+        self.assertIs(solution.solve(grid, 'bitmask', cache=self.cache), False)
+        self.assertIs(solution.solve(grid, 'bitmask', cache=self.cache), False)
+        self.assertEqual(self.cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import unittest
+
+import corpus
+
+
+class TestCorpusRunner(unittest.TestCase):
+    grids = ['2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3',
+             '22' + '.' * 79,
+             '........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.']
+
+    def test_results_in_input_order(self):
+        inline = list(corpus.run(self.grids * 3, processes=1))
+        pooled = list(corpus.run(iter(self.grids * 3), processes=2, chunksize=2))
+        self.assertEqual([r[0] for r in pooled], [r[0] for r in inline])
+        self.assertEqual([r[2] for r in pooled], [r[2] for r in inline])
+
+    def test_output_format(self):
+        infile = io.StringIO('\n'.join(self.grids) + '\n\n')
+        outfile = io.StringIO()
+        corpus.main(infile, outfile, 'bitmask', 1, 64)
+
+        lines = outfile.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        grid, elapsed, nodes = lines[0].split('\t')
+        self.assertEqual(grid[0], '2')
+        self.assertNotIn('.', grid)
+        self.assertEqual(lines[1].split('\t')[0], self.grids[1])
+        self.assertGreater(int(nodes), 0)
+
+    def test_invalid_lines(self):
+        grids = [self.grids[0], '12', '0' * 81, self.grids[2]]
+        results = list(corpus.run(grids, processes=2, chunksize=1))
+        self.assertEqual(len(results), 4)
+        self.assertIsNone(results[0][3])
+        self.assertIn('not an n^2 x n^2 Sudoku', results[1][3])
+        self.assertIn('Unexpected characters', results[2][3])
+        self.assertNotIn('.', results[3][0])
+
+        outfile = io.StringIO()
+        corpus.main(io.StringIO('\n'.join(grids)), outfile, 'dlx', 1, 64)
+        lines = outfile.getvalue().splitlines()
+        self.assertEqual(lines[1].split('\t')[:2], ['12', 'error'])
+        self.assertEqual(lines[2].split('\t')[:2], ['0' * 81, 'error'])
+
+    def test_other_board_sizes(self):
+        grids = ['1...' '..3.' '....' '....', '.' * 256]
+        results = list(corpus.run(grids, processes=2, chunksize=1))
+        self.assertEqual([r[3] for r in results], [None, None])
+        self.assertEqual(results[0][0], '1324423131422413')
+        self.assertEqual(len(results[1][0]), 256)
+        self.assertNotIn('.', results[1][0])
+
+        # The dictionary engines only solve 9x9 boards
+        grid, elapsed, nodes, error = corpus.solve_one(grids[0], 'dlx')
+        self.assertEqual(grid, grids[0])
+        self.assertIn('only solves 9x9', error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+import dlx
+import solution
+
+
+class TestDancingLinks(unittest.TestCase):
+    grids = ['2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3',
+             '...6..5.....5........2...87..9..1........5.............85.......7..3..5...1.5...9',
+             '........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.']
+
+    def assertSolves(self, values, grid):
+        for box, val in zip(solution.boxes, grid):
+            if val != '.':
+                self.assertEqual(values[box], val)
+        for unit in solution.unitlist:
+            self.assertEqual(sorted(values[box] for box in unit), list('123456789'))
+
+    def test_solve(self):
+        self.assertEqual(solution.solve(self.grids[0], engine='dlx'), solution.solve(self.grids[0]))
+        for grid in self.grids:
+            self.assertSolves(solution.solve(grid, engine='dlx'), grid)
+
+    def test_conflicting_givens(self):
+        self.assertIs(solution.solve('22' + '.' * 79, engine='dlx'), False)
+
+    def test_count_solutions(self):
+        self.assertEqual(dlx.count_solutions(self.grids[0]), 1)
+        self.assertEqual(dlx.count_solutions('.' * 81, limit=3), 3)
+
+    def test_empty_grid(self):
+        self.assertSolves(dlx.solve('.' * 81), '.' * 81)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+
+import dlx
+import generator
+import solution
+
+
+class TestGenerator(unittest.TestCase):
+
+    def test_random_fill(self):
+        cells = generator.random_fill([generator.bitmask.ALL] * 81, random.Random(0))
+        grid = generator.bitmask.cells2grid(cells)
+        self.assertNotIn('.', grid)
+        self.assertEqual(solution.solve(grid, 'dlx'), generator.bitmask.cells2values(cells))
+
+    def test_unique_puzzles(self):
+        puzzles = list(generator.generate_many(4, clues=30, processes=1, seed=7, chunksize=2))
+        self.assertEqual(len(puzzles), 4)
+        for puzzle in puzzles:
+            self.assertEqual(len(puzzle), 81)
+            self.assertEqual(81 - puzzle.count('.'), 30)
+            self.assertEqual(dlx.count_solutions(puzzle, limit=2), 1)
+
+    def test_unreachable_clues(self):
+        with self.assertRaises(ValueError):
+            generator.generate(5, random.Random(0))
+        with self.assertRaises(ValueError):
+            list(generator.generate_many(1, clues=82, processes=1))
+
+    def test_attempts_are_capped(self):
+        max_attempts = generator.MAX_ATTEMPTS
+        generator.MAX_ATTEMPTS = 2
+        try:
+            with self.assertRaises(RuntimeError):
+                generator.generate(8, random.Random(0))
+        finally:
+            generator.MAX_ATTEMPTS = max_attempts
+
+    def test_seeded_runs_repeat(self):
+        self.assertEqual(list(generator.generate_many(2, processes=1, seed=3)),
+                         list(generator.generate_many(2, processes=2, seed=3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from collections import Counter
+
+import benchmark
+import kernel
+import solution
+
+
+class TestKernel(unittest.TestCase):
+
+    def assertAgree(self, grids):
+        for grid in grids:
+            compiled, pure = Counter(), Counter()
+            self.assertEqual(kernel.solve(grid, compiled), solution.solve(grid, 'bitmask', pure))
+            for key in ('nodes', 'backtracks', 'max_depth'):
+                self.assertEqual(compiled[key], pure[key])
+
+    @unittest.skipIf(kernel.njit is None, "the compiled kernel requires Numba")
+    def test_agrees_with_bitmask(self):
+        for tier in benchmark.TIERS:
+            self.assertAgree(benchmark.load_tier(tier))
+
+    @unittest.skipIf(kernel.njit is None, "the compiled kernel requires Numba")
+    def test_other_topologies(self):
+        from topology import get_topology
+        for topology, grid in ((get_topology(2, True), '1...' '..3.' '....' '....'),
+                               (get_topology(3, False), '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......')):
+            self.assertEqual(kernel.solve(grid, topology=topology), solution.solve(grid, 'bitmask', topology=topology))
+
+    def test_unsolvable(self):
+        self.assertIs(solution.solve('22' + '.' * 79, 'kernel'), False)
+        self.assertAgree(['12345678.' + '........9' + '.' * 63])
+
+
+if __name__ == '__main__':
+    unittest.main()
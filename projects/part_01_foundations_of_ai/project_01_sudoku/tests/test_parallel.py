@@ -0,0 +1,45 @@
+import unittest
+from collections import Counter
+
+import benchmark
+import parallel
+import solution
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_agrees_with_dlx(self):
+        for grid in benchmark.load_tier('pathological')[:2]:
+            stats = Counter()
+            values = parallel.solve(grid, stats, processes=2, depth=2)
+            self.assertEqual(values, solution.solve(grid, 'dlx'))
+            self.assertGreater(stats['nodes'], 0)
+
+    def test_solved_while_expanding(self):
+        grid = benchmark.load_tier('easy')[0]
+        self.assertEqual(parallel.solve(grid, processes=2), solution.solve(grid, 'dlx'))
+
+    def test_split_until_one_branch_per_process(self):
+        grid = benchmark.load_tier('pathological')[0]
+        cells = parallel.bitmask.grid2cells(grid)
+        for target in (1, 4, 16):
+            branches, solved = parallel.split(cells, parallel.bitmask.DEFAULT, target)
+            self.assertIs(solved, False)
+            self.assertGreaterEqual(len(branches), target)
+        branches, _ = parallel.split(cells, parallel.bitmask.DEFAULT, 100, depth=1)
+        self.assertEqual(branches, parallel.expand(cells, parallel.bitmask.DEFAULT, 1)[0])
+
+    def test_pool_is_reused(self):
+        grids = benchmark.load_tier('pathological')[:2]
+        self.assertEqual(parallel.solve(grids[0], processes=2), solution.solve(grids[0], 'dlx'))
+        pool = parallel.get_pool(2)
+        self.assertEqual(parallel.solve(grids[1], processes=2), solution.solve(grids[1], 'dlx'))
+        self.assertIs(parallel.get_pool(2), pool)
+
+    def test_no_solution(self):
+        grid = '12345678.' + '........9' + '.' * 63
+        self.assertIs(solution.solve(grid, 'parallel'), False)
+
+
+if __name__ == '__main__':
+    unittest.main()
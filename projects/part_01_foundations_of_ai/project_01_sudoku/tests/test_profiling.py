@@ -0,0 +1,42 @@
+import unittest
+from collections import Counter
+
+import benchmark
+import solution
+
+
+class TestSolverStats(unittest.TestCase):
+
+    def test_eliminations_add_up(self):
+        grid = benchmark.load_tier('easy')[0]
+        for engine in ('search', 'bitmask'):
+            values, stats = solution.solve_with_stats(grid, engine)
+            self.assertEqual(values, solution.solve(grid, 'dlx'))
+            # Propagation alone takes every box down to a single candidate
+            start = 9 * grid.count('.') + 81 - grid.count('.')
+            self.assertEqual(sum(stats.eliminated.values()), start - 81)
+            self.assertEqual(stats['nodes'], 1)
+            self.assertGreater(stats['passes'], 0)
+
+    def test_search_counters(self):
+        grid = benchmark.load_tier('pathological')[0]
+        for engine in ('search', 'trail', 'bitmask', 'strategies'):
+            values, stats = solution.solve_with_stats(grid, engine)
+            self.assertEqual(values, solution.solve(grid, 'dlx'))
+            self.assertGreater(stats['backtracks'], 0)
+            self.assertLess(stats['backtracks'], stats['nodes'])
+            self.assertGreater(stats['max_depth'], 0)
+            flat = stats.as_dict()
+            for key in ('nodes', 'backtracks', 'max_depth', 'passes', 'only_choice.seconds'):
+                self.assertIn(key, flat)
+
+    def test_plain_counter(self):
+        grid = benchmark.load_tier('pathological')[0]
+        stats = Counter()
+        solution.solve(grid, 'bitmask', stats)
+        profiled = solution.solve_with_stats(grid, 'bitmask')[1]
+        self.assertEqual(stats, Counter(dict(profiled)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from itertools import islice
+
+import solution
+from utils import History, grid2values, set_recorder
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+
+@unittest.skipIf(pygame is None, "the visualizer requires pygame")
+class TestHeadlessReplay(unittest.TestCase):
+    grid = '........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.'
+
+    def setUp(self):
+        self.frames = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.frames)
+
+    def test_one_frame_per_step(self):
+        import PySudoku
+        history = History()
+        previous = set_recorder(history)
+        try:
+            solution.solve(self.grid)
+        finally:
+            set_recorder(previous)
+
+        # Steps are consumed lazily from any iterator
+        PySudoku.play(grid2values(self.grid), islice(history, 5), frames=self.frames)
+        self.assertEqual(len(os.listdir(self.frames)), 6)
+
+    def test_streamed_steps(self):
+        import PySudoku
+        steps = solution.solve_steps(self.grid)
+        try:
+            PySudoku.play(grid2values(self.grid), islice(steps, 3), frames=self.frames)
+        finally:
+            steps.close()
+        self.assertEqual(len(os.listdir(self.frames)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from collections import Counter
+
+import benchmark
+import sat
+import solution
+from topology import get_topology
+
+
+class TestDPLL(unittest.TestCase):
+
+    def test_satisfiable(self):
+        clauses = [[1, 2, 3], [-1, -2], [-1, -3], [-2, -3], [-1], [2, -3, 4], [-4]]
+        model = sat.DPLL(4, clauses).solve()
+        self.assertEqual(model[1:], [-1, 1, -1, -1])
+
+    def test_unsatisfiable(self):
+        clauses = [[1, 2], [-1, 2], [1, -2], [-1, -2]]
+        self.assertIs(sat.DPLL(2, clauses).solve(), False)
+        self.assertIs(sat.DPLL(1, [[1], [-1]]).solve(), False)
+        self.assertIs(sat.DPLL(1, [[]]).solve(), False)
+
+
+class TestSudokuEncoding(unittest.TestCase):
+
+    def test_clause_count(self):
+        topology = get_topology(2, diagonal=True)
+        n_vars, clauses = sat.encode('1...' '..3.' '....' '....', topology)
+        self.assertEqual(n_vars, 64)
+        # at least one and at most one per box and per unit digit, and 2 givens
+        self.assertEqual(len(clauses), 16 * (1 + 6) + 14 * 4 * (1 + 6) + 2)
+
+    def test_agrees_with_dlx(self):
+        for tier in benchmark.TIERS:
+            for grid in benchmark.load_tier(tier)[:5]:
+                stats = Counter()
+                self.assertEqual(solution.solve(grid, 'sat', stats), solution.solve(grid, 'dlx'))
+
+    def test_unsolvable(self):
+        self.assertIs(solution.solve('22' + '.' * 79, 'sat'), False)
+        self.assertIs(solution.solve('12345678.' + '........9' + '.' * 63, 'sat'), False)
+
+
+if __name__ == '__main__':
+    unittest.main()
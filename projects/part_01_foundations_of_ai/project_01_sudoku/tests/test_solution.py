@@ -82,6 +82,24 @@ class TestNakedTwins(unittest.TestCase):
 
 
 
+class TestNakedSubsets(unittest.TestCase):
+
+    def test_naked_triples(self):
+        values = solution.grid2values('.' * 81)
+        values.update(A1='12', A2='23', A3='13', A4='1234')
+        values = solution.naked_subsets(values, 3)
+        self.assertEqual(values['A4'], '4')
+        self.assertEqual(values['A9'], '456789')
+        self.assertEqual(values['C3'], '456789')
+        self.assertEqual(values['D1'], '123456789')
+
+    def test_twins_found_once_per_unit(self):
+        values = solution.grid2values('.' * 81)
+        values.update(A1='12', A2='12')
+        self.assertEqual(solution.find_naked_subsets(values, solution.row_units[0]), [('12', ['A1', 'A2'])])
+        self.assertEqual(solution.find_naked_subsets(values, solution.column_units[0]), [])
+
+
 class TestDiagonalSudoku(unittest.TestCase):
     diagonal_grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
     solved_diag_sudoku = {'G7': '8', 'G6': '9', 'G5': '7', 'G4': '3', 'G3': '2', 'G2': '4', 'G1': '6', 'G9': '5',
@@ -99,5 +117,81 @@ class TestDiagonalSudoku(unittest.TestCase):
     def test_solve(self):
         self.assertEqual(solution.solve(self.diagonal_grid), self.solved_diag_sudoku)
 
+class TestReducePuzzle(unittest.TestCase):
+
+    def test_reduce_fills_missing_boxes(self):
+        solved = dict(TestDiagonalSudoku.solved_diag_sudoku)
+        values = dict(solved, A1='123456789', E5='123456789', I9='123456789')
+        self.assertEqual(solution.reduce_puzzle(values), solved)
+
+    def test_reduce_detects_contradiction(self):
+        self.assertIs(solution.reduce_puzzle(solution.grid2values('22' + '.' * 79)), False)
+        self.assertIs(solution.reduce_puzzle(solution.grid2values('12345678.' + '........9' + '.' * 63)), False)
+
+
+class TestSearchTrail(unittest.TestCase):
+    diagonal_grid = TestDiagonalSudoku.diagonal_grid
+    hard_grid = '........4......1.....6......7....2.8...372.4.......3.7......4......5.6....4....2.'
+
+    def test_solve(self):
+        self.assertEqual(solution.solve(self.diagonal_grid, engine='trail'),
+                         TestDiagonalSudoku.solved_diag_sudoku)
+        self.assertEqual(solution.solve(self.hard_grid, engine='trail'), solution.solve(self.hard_grid))
+
+    def test_failed_search_leaves_board_unchanged(self):
+        values = solution.grid2values('22' + '.' * 79)
+        before = dict(values)
+        self.assertIs(solution.search_trail(values), False)
+        self.assertEqual(values, before)
+
+        import utils
+        self.assertIsNone(utils.trail)
+
+
+class TestHistory(unittest.TestCase):
+    diagonal_grid = TestDiagonalSudoku.diagonal_grid
+
+    def tearDown(self):
+        solution.set_recorder(None)
+
+    def test_off_by_default(self):
+        import utils
+        self.assertIsNone(utils.recorder)
+
+    def test_replay(self):
+        for engine in ('search', 'trail'):
+            history = solution.History()
+            solution.set_recorder(history)
+            result = solution.solve(self.diagonal_grid, engine=engine)
+
+            values = solution.grid2values(self.diagonal_grid)
+            for box, value in solution.reconstruct(result, history):
+                values[box] = value
+            self.assertEqual(values, result)
+
+    def test_solve_steps(self):
+        import utils
+        for engine in ('search', 'trail'):
+            values = solution.grid2values(self.diagonal_grid)
+            for box, value in solution.solve_steps(self.diagonal_grid, engine, maxsize=4):
+                values[box] = value
+            self.assertEqual(values, solution.solve(self.diagonal_grid, engine))
+            self.assertIsNone(utils.recorder)
+
+    def test_solve_steps_closed_early(self):
+        import utils
+        hard_grid = TestSearchTrail.hard_grid
+        steps = solution.solve_steps(hard_grid, maxsize=2)
+        self.assertEqual(len([step for step, _ in zip(steps, range(10))]), 10)
+        steps.close()
+        self.assertIsNone(utils.recorder)
+
+    def test_solve_steps_invalid_grid(self):
+        import utils
+        with self.assertRaises(ValueError):
+            list(solution.solve_steps('.' * 80))
+        self.assertIsNone(utils.recorder)
+
+
 if __name__ == '__main__':
     unittest.main()
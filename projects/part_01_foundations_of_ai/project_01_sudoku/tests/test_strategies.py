@@ -0,0 +1,70 @@
+import unittest
+from collections import Counter
+
+import benchmark
+import solution
+import strategies
+from topology import get_topology
+
+
+class TestStrategies(unittest.TestCase):
+
+    def setUp(self):
+        self.topology = get_topology(3, diagonal=False)
+        self.cells = [self.topology.all] * 81
+
+    def restrict(self, digit_bit, keep):
+        """Remove a digit from every box of the first row except `keep`"""
+        for c in range(9):
+            if c not in keep:
+                self.cells[c] &= ~digit_bit
+
+    def test_hidden_pairs(self):
+        self.restrict(1, (0, 1))
+        self.restrict(2, (0, 1))
+        self.assertEqual(strategies.hidden_subsets(self.cells, self.topology, 2), 14)
+        self.assertEqual(self.cells[0], 3)
+        self.assertEqual(self.cells[1], 3)
+
+    def test_box_line_reduction(self):
+        self.restrict(1, (0, 1))
+        self.assertEqual(strategies.box_line_reduction(self.cells, self.topology), 6)
+        self.assertFalse(self.cells[9] & 1)
+        self.assertFalse(self.cells[20] & 1)
+        self.assertTrue(self.cells[0] & 1)
+
+    def test_pointing(self):
+        for i in (2, 9, 10, 11, 18, 19, 20):
+            self.cells[i] &= ~1
+        self.assertEqual(strategies.pointing(self.cells, self.topology), 6)
+        self.assertFalse(any(self.cells[c] & 1 for c in range(3, 9)))
+
+    def test_x_wing(self):
+        for r in (0, 4):
+            for c in range(9):
+                if c not in (0, 4):
+                    self.cells[r * 9 + c] &= ~1
+        self.assertEqual(strategies.x_wing(self.cells, self.topology), 14)
+        self.assertFalse(self.cells[9] & 1)
+        self.assertTrue(self.cells[36] & 1)
+
+    def test_pipeline_orders_by_benefit(self):
+        pipeline = strategies.StrategyPipeline()
+        self.restrict(1, (0, 1))
+        self.assertTrue(pipeline.apply(self.cells, self.topology))
+        report = pipeline.report()
+        self.assertEqual(sum(s['calls'] for s in report), 4)
+        self.assertEqual([s['name'] for s in report if s['eliminated']], ['box_line_reduction'])
+
+
+class TestStrategiesEngine(unittest.TestCase):
+
+    def test_fewer_nodes(self):
+        for grid in benchmark.load_tier('hard')[:5]:
+            plain, pruned = Counter(), Counter()
+            self.assertEqual(solution.solve(grid, 'strategies', pruned), solution.solve(grid, 'bitmask', plain))
+            self.assertLessEqual(pruned['nodes'], plain['nodes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+import solution
+import sudoku
+import utils
+
+
+class TestVerboseSolve(unittest.TestCase):
+    grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    def test_same_engine(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            result = sudoku.solve(self.grid)
+        self.assertEqual(result, solution.solve(self.grid))
+        self.assertIsNone(utils.recorder)
+
+        # The last board printed is the solution
+        last = out.getvalue().split('=>')[-1]
+        self.assertEqual(''.join(c for c in last if c.isdigit()), utils.values2grid(result))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import solution
+from topology import SudokuTopology, get_topology, topology_for_grid
+
+
+class TestSudokuTopology(unittest.TestCase):
+
+    def test_cached(self):
+        self.assertIs(get_topology(4), get_topology(4))
+        self.assertIsNot(get_topology(4, diagonal=True), get_topology(4, diagonal=False))
+        self.assertIs(topology_for_grid('.' * 256), get_topology(4))
+
+    def test_9x9_tables(self):
+        topology = get_topology(3)
+        self.assertEqual(len(topology.units), 29)
+        self.assertEqual(topology.box_peers()['A1'], solution.peers['A1'])
+        self.assertEqual(len(solution.peers['A1']), 26)
+        self.assertEqual(len(solution.peers['E5']), 32)
+        self.assertEqual(len(solution.peers['A2']), 20)
+        self.assertEqual(len(get_topology(3, diagonal=False).peers[0]), 20)
+
+    def test_shared_tables_are_immutable(self):
+        topology = get_topology(3)
+        self.assertIs(solution.unitlist, topology.unitlist)
+        with self.assertRaises(AttributeError):
+            solution.peers['A1'].add('A2')
+        with self.assertRaises(TypeError):
+            solution.units['A1'] = ()
+        with self.assertRaises(TypeError):
+            solution.unitlist[0] = ()
+        unitlist = solution.unitlist
+        unitlist += (('A1',),)
+        self.assertEqual(len(topology.unitlist), 29)
+
+    def test_unsupported_boards(self):
+        self.assertRaises(ValueError, SudokuTopology, 6)
+        self.assertRaises(ValueError, topology_for_grid, '.' * 80)
+
+    def assertSolves(self, values, grid, topology):
+        for box, val in zip(topology.boxes, grid):
+            if val != '.':
+                self.assertEqual(values[box], val)
+        for unit in topology.unitlist:
+            self.assertEqual(sorted(values[box] for box in unit), sorted(topology.symbols))
+
+    def test_solve_other_sizes(self):
+        grid = '1...' '..3.' '....' '....'
+        self.assertSolves(solution.solve(grid, engine='bitmask'), grid, get_topology(2))
+
+        topology = get_topology(4, diagonal=False)
+        grid = 'G' + '.' * 254 + '1'
+        self.assertSolves(solution.solve(grid, engine='bitmask', topology=topology), grid, topology)
+
+    def test_other_sizes_need_bitmask_engine(self):
+        self.assertRaises(ValueError, solution.solve, '.' * 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
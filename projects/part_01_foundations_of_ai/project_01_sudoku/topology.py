@@ -0,0 +1,154 @@
+"""Board topology (boxes, units and peers) for n^2 x n^2 Sudoku variants.
+
+A `SudokuTopology` describes the board of order n: n^2 x n^2 boxes, the rows,
+columns and n x n squares, and optionally the two diagonal units. The tables are
+kept compact, as tuples of cell indexes (cell i is row i // n^2, column
+i % n^2), and the box-name forms used by `solution.py` ('A1', 'A2', ...) are
+derived from them. Topologies are built once per (n, diagonal) and cached, see
+`get_topology`.
+
+Since every module using a board shares its topology, all the tables are
+immutable: tuples, frozensets and read-only mappings.
+"""
+from types import MappingProxyType
+
+
+SYMBOLS = '123456789ABCDEFGHIJKLMNOP'
+ROW_LABELS = 'ABCDEFGHIJKLMNOPQRSTUVWXY'
+
+# Boards with at most this many digits get a precomputed popcount table
+COUNT_TABLE_MAX_SIZE = 16
+
+
+class SudokuTopology(object):
+    """The boxes, units and peers of an n^2 x n^2 Sudoku board
+
+    Parameters
+    ----------
+    n : int
+        The order of the board: the squares are n x n and the board is n^2 x n^2
+        (2 for 4x4, 3 for 9x9, 4 for 16x16, 5 for 25x25).
+
+    diagonal : bool
+        Whether the two main diagonals are units as well.
+    """
+
+    def __init__(self, n=3, diagonal=True):
+        if not 2 <= n <= 5:
+            raise ValueError("Boards of order {} are not supported (2 <= n <= 5)".format(n))
+
+        size = n * n
+        self.n = n
+        self.size = size
+        self.diagonal = diagonal
+        self.n_cells = size * size
+        self.symbols = SYMBOLS[:size]
+        self.all = (1 << size) - 1
+
+        self.rows = ROW_LABELS[:size]
+        self.cols = tuple(str(c) for c in range(1, size + 1))
+        self.boxes = tuple(r + c for r in self.rows for c in self.cols)
+        self.index = MappingProxyType(dict((box, i) for i, box in enumerate(self.boxes)))
+
+        row_units = [tuple(r * size + c for c in range(size)) for r in range(size)]
+        column_units = [tuple(r * size + c for r in range(size)) for c in range(size)]
+        square_units = [tuple((br * n + r) * size + bc * n + c for r in range(n) for c in range(n))
+                        for br in range(n) for bc in range(n)]
+        diag_units = []
+        if diagonal:
+            diag_units = [tuple(i * size + i for i in range(size)),
+                          tuple(i * size + size - 1 - i for i in range(size))]
+        self.row_units = tuple(row_units)
+        self.column_units = tuple(column_units)
+        self.square_units = tuple(square_units)
+        self.diag_units = tuple(diag_units)
+        self.units = self.row_units + self.column_units + self.square_units + self.diag_units
+
+        cell_units = [[] for _ in range(self.n_cells)]
+        for u, unit in enumerate(self.units):
+            for i in unit:
+                cell_units[i].append(u)
+        self.cell_units = tuple(tuple(ids) for ids in cell_units)
+        self.peers = tuple(tuple(sorted(set(j for u in ids for j in self.units[u]) - set([i])))
+                           for i, ids in enumerate(self.cell_units))
+
+        if size <= COUNT_TABLE_MAX_SIZE:
+            self.popcount = tuple(bin(mask).count('1') for mask in range(self.all + 1)).__getitem__
+        else:
+            self.popcount = lambda mask: bin(mask).count('1')
+        self.bits = tuple(1 << d for d in range(size))
+        self.symbol_bits = MappingProxyType(dict((s, 1 << d) for d, s in enumerate(self.symbols)))
+
+        # Box-name tables, see unitlist, box_units and box_peers
+        self._unitlist = self._box_units = self._box_peers = None
+
+    def __repr__(self):
+        return "SudokuTopology(n={}, diagonal={})".format(self.n, self.diagonal)
+
+    @property
+    def unitlist(self):
+        """The units as tuples of box names, built on first use and shared by
+        every module using this topology"""
+        if self._unitlist is None:
+            self._unitlist = tuple(tuple(self.boxes[i] for i in unit) for unit in self.units)
+        return self._unitlist
+
+    def box_units(self):
+        """Return a read-only mapping of the form {'box_name': (unit, ...)} with
+        units as tuples of box names"""
+        if self._box_units is None:
+            unitlist = self.unitlist
+            self._box_units = MappingProxyType(dict((box, tuple(unitlist[u] for u in self.cell_units[i]))
+                                                    for i, box in enumerate(self.boxes)))
+        return self._box_units
+
+    def box_peers(self):
+        """Return a read-only mapping of the form {'box_name': frozenset(peer box names)}"""
+        if self._box_peers is None:
+            self._box_peers = MappingProxyType(dict((box, frozenset(self.boxes[j] for j in self.peers[i]))
+                                                    for i, box in enumerate(self.boxes)))
+        return self._box_peers
+
+    def mask2str(self, mask):
+        """Return the candidate string of a mask, e.g. '137'"""
+        return ''.join(s for d, s in enumerate(self.symbols) if mask >> d & 1)
+
+    def grid2cells(self, grid):
+        """Convert a grid string ('.' for empty boxes) into a list of candidate masks"""
+        if len(grid) != self.n_cells:
+            raise ValueError("Expected a grid of {} characters, got {}".format(self.n_cells, len(grid)))
+        symbol_bits = self.symbol_bits
+        return [self.all if val == '.' else symbol_bits[val] for val in grid]
+
+    def cells2grid(self, cells):
+        """Convert a list of candidate masks into a grid string ('.' for unsolved boxes)"""
+        popcount = self.popcount
+        return ''.join(self.mask2str(mask) if popcount(mask) == 1 else '.' for mask in cells)
+
+    def values2cells(self, values):
+        """Convert the dictionary board representation into a list of candidate masks"""
+        symbol_bits = self.symbol_bits
+        return [sum(symbol_bits[s] for s in values[box]) for box in self.boxes]
+
+    def cells2values(self, cells):
+        """Convert a list of candidate masks into the dictionary board representation"""
+        return dict((box, self.mask2str(mask)) for box, mask in zip(self.boxes, cells))
+
+
+_topologies = {}
+
+
+def get_topology(n=3, diagonal=True):
+    """Return the cached topology of the n^2 x n^2 board, building it on first use"""
+    key = (n, diagonal)
+    if key not in _topologies:
+        _topologies[key] = SudokuTopology(n, diagonal)
+    return _topologies[key]
+
+
+def topology_for_grid(grid, diagonal=True):
+    """Return the topology matching the length of a grid string"""
+    for n in range(2, 6):
+        if n ** 4 == len(grid):
+            return get_topology(n, diagonal)
+    raise ValueError("A grid of {} characters is not an n^2 x n^2 Sudoku".format(len(grid)))
@@ -1,15 +1,198 @@
 
 
-rows = 'ABCDEFGHI'
-cols = '123456789'
-boxes = [r + c for r in rows for c in cols]
-history = {}  # history must be declared here so that it exists in the assign_values scope
+from queue import Queue, Full
+
+from topology import get_topology
+
+
+topology = get_topology(3, diagonal=True)
+rows = topology.rows
+cols = ''.join(topology.cols)
+boxes = topology.boxes
+
+
+class History(object):
+    """Append-only log of the (box, value) assignments made during one solve.
+
+    Install it with `set_recorder` to record the assignments made through
+    `assign_value`. The search functions rewind the log when they backtrack, so
+    after a solve it holds the assignments that lead to the solution.
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def record(self, box, value):
+        self.steps.append((box, value))
+
+    def mark(self):
+        """Return the current position in the log"""
+        return len(self.steps)
+
+    def rewind(self, mark):
+        """Drop every step recorded since `mark` was taken"""
+        del self.steps[mark:]
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def __len__(self):
+        return len(self.steps)
+
+
+class BoardHistory(History):
+    """A history that also keeps the board of the current search path.
+
+    Every assignment is applied to `values`, and when the search rewinds, the
+    boxes are set back to their previous value. Subclasses react to both
+    through `assigned` and `restored`; only the assignments of the current
+    search path are kept, to know what to set back.
+
+    Parameters
+    ----------
+    values(dict)
+        the starting puzzle in dictionary form
+    """
+
+    def __init__(self, values):
+        super(BoardHistory, self).__init__()
+        self.values = dict(values)
+        self.previous = []
+
+    def assigned(self, box, value):
+        """Called after `value` was assigned to `box`"""
+
+    def restored(self, box, value):
+        """Called after `box` was set back to `value` by a rewind"""
+
+    def record(self, box, value):
+        super(BoardHistory, self).record(box, value)
+        self.previous.append(self.values[box])
+        self.values[box] = value
+        self.assigned(box, value)
+
+    def rewind(self, mark):
+        for (box, value), previous in reversed(list(zip(self.steps[mark:], self.previous[mark:]))):
+            self.values[box] = previous
+            self.restored(box, previous)
+        del self.previous[mark:]
+        super(BoardHistory, self).rewind(mark)
+
+
+class StreamClosed(Exception):
+    """Raised in the solver when the consumer of a `StepStream` stops reading"""
+
+
+class StepStream(BoardHistory):
+    """A recorder that hands every assignment over to another thread as it is
+    made, through a bounded queue, instead of keeping the whole log.
+
+    The boxes set back by a rewind are queued as more steps, so applying the
+    steps in order follows the search, failed branches included.
+
+    Parameters
+    ----------
+    values(dict)
+        the starting puzzle in dictionary form
+
+    maxsize(int)
+        the number of steps the solver can run ahead of the consumer
+    """
+
+    def __init__(self, values, maxsize=64):
+        super(StepStream, self).__init__(values)
+        self.queue = Queue(maxsize)
+        self.closed = False
+
+    def put(self, step):
+        """Queue a step, waiting for room; raise StreamClosed if the consumer is gone"""
+        while not self.closed:
+            try:
+                self.queue.put(step, timeout=0.1)
+                return
+            except Full:
+                pass
+        raise StreamClosed()
+
+    def assigned(self, box, value):
+        self.put((box, value))
+
+    def restored(self, box, value):
+        self.put((box, value))
+
+
+history = History()  # the default log; recording is off until set_recorder(history)
+recorder = None
+trail = None  # the undo log of assign_value, see set_trail
+
+
+def set_recorder(new_recorder):
+    """Install the recorder that `assign_value` reports assignments to.
+
+    Parameters
+    ----------
+    new_recorder(History or None)
+        an object with `record(box, value)`, `mark()` and `rewind(mark)`
+        methods, or None to turn recording off (the default)
+
+    Returns
+    -------
+    History or None
+        The previously installed recorder
+    """
+    global recorder
+    previous, recorder = recorder, new_recorder
+    return previous
+
+
+def history_mark():
+    """Return the current position of the installed recorder (None when off)"""
+    if recorder is not None:
+        return recorder.mark()
+
+
+def history_rewind(mark):
+    """Rewind the installed recorder to a position returned by `history_mark`"""
+    if recorder is not None:
+        recorder.rewind(mark)
+
+
+def set_trail(new_trail):
+    """Install the undo log that `assign_value` appends the (box, previous
+    value) of every change to, so that `undo_trail` can roll a board back.
+
+    Parameters
+    ----------
+    new_trail(list or None)
+        the log, or None to turn it off (the default)
+
+    Returns
+    -------
+    list or None
+        The previously installed trail
+    """
+    global trail
+    previous, trail = trail, new_trail
+    return previous
+
+
+def trail_mark():
+    """Return the current position on the installed trail"""
+    return len(trail)
+
+
+def undo_trail(values, mark):
+    """Restore every box of `values` changed since the trail position `mark`"""
+    while len(trail) > mark:
+        box, value = trail.pop()
+        values[box] = value
 
 
 def assign_value(values, box, value):
     """You must use this function to update your values dictionary if you want to
-    try using the provided visualization tool. This function records each assignment
-    (in order) for later reconstruction.
+    try using the provided visualization tool. This function reports each
+    single-value assignment (in order) to the installed recorder, if any, for
+    later reconstruction.
 
     Parameters
     ----------
@@ -25,10 +208,11 @@ def assign_value(values, box, value):
     if values[box] == value:
         return values
 
-    prev = values2grid(values)
+    if trail is not None:
+        trail.append((box, values[box]))
     values[box] = value
-    if len(value) == 1:
-        history[values2grid(values)] = (prev, (box, value))
+    if recorder is not None and len(value) == 1:
+        recorder.record(box, value)
     return values
 
 
@@ -109,10 +293,11 @@ def reconstruct(values, history):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
-    history(dict)
-        a dictionary of the form {key: (key, (box, value))} encoding a linked
-        list where each element points to the parent and identifies the value
-        assignment that connects from the parent to the current state
+    history(History or dict)
+        the log recorded while solving, or a dictionary of the form
+        {key: (key, (box, value))} encoding a linked list where each element
+        points to the parent and identifies the value assignment that connects
+        from the parent to the current state
 
     Returns
     -------
@@ -120,6 +305,9 @@ def reconstruct(values, history):
         a list of (box, value) assignments that can be applied in order to the
         starting Sudoku puzzle to reach the solution
     """
+    if isinstance(history, History):
+        return list(history)
+
     path = []
     prev = values2grid(values)
     while prev in history:
@@ -3,6 +3,9 @@ test your agent's strength against a set of known agents using tournament.py
 and include the results in your report.
 """
 import random
+import timeit
+
+from multiprocessing import Pool, TimeoutError, cpu_count
 
 
 class SearchTimeout(Exception):
@@ -362,16 +365,22 @@ class MinimaxPlayer(IsolationPlayer):
         if maximizing:
             best_score = float("-inf")
             for move in legal_moves:
-                next_state = game.forecast_move(move)
-                _, score = self.mm(next_state, depth-1, False)
+                game.push_move(move)
+                try:
+                    _, score = self.mm(game, depth-1, False)
+                finally:
+                    game.pop_move()
                 if score > best_score:
                     best_move = move
                     best_score = score
         else:
             best_score = float("inf")
             for move in legal_moves:
-                next_state = game.forecast_move(move)
-                _, score = self.mm(next_state, depth-1, True)
+                game.push_move(move)
+                try:
+                    _, score = self.mm(game, depth-1, True)
+                finally:
+                    game.pop_move()
                 if score < best_score:
                     best_move = move
                     best_score = score
@@ -379,12 +388,84 @@ class MinimaxPlayer(IsolationPlayer):
         return (best_move, best_score)
 
 
+# The kinds of score kept in a transposition table entry
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# XORed into the table key of positions in which the agent is player 2, as
+# the scores stored are those of the agent's side
+PLAYER_2_KEY = 0x9E3779B97F4A7C15
+
+
+class TranspositionTable(object):
+    """A bounded table of searched positions, keyed by `Board.hash()`
+
+    Every entry is a tuple (key, depth, score, flag, move, generation): the
+    score of a search `depth` plies deep, which is exact or only a LOWER or
+    UPPER bound when the search was cut off, and the best move found. The key
+    picks one of `size` slots. When two positions compete for a slot, the
+    deeper search is kept, unless the entry in the slot is from an earlier
+    generation (turn), which is always replaced.
+
+    Parameters
+    ----------
+    size : int (optional)
+        The number of slots of the table
+    """
+
+    def __init__(self, size=2**16):
+        self.size = size
+        self.entries = [None] * size
+        self.generation = 0
+
+    def new_generation(self):
+        """Mark the entries stored until now as old, e.g. at the start of a turn"""
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+
+    def lookup(self, key):
+        """Return the entry of the position with hash `key`, or None"""
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        slot = key % self.size
+        entry = self.entries[slot]
+        if entry is None or entry[5] != self.generation or depth >= entry[1]:
+            self.entries[slot] = (key, depth, score, flag, move, self.generation)
+
+
 class AlphaBetaPlayer(IsolationPlayer):
     """Game-playing agent that chooses a move using iterative deepening minimax
     search with alpha-beta pruning. You must finish and test this player to
     make sure it returns a good move before the search time limit expires.
+
+    The scores of the positions searched are kept in a transposition table
+    that persists across the iterations of a turn, and across turns and games.
+    The table keys depend on the side the agent plays (see `table_key`), so
+    the agent can play either side of the same positions with one table.
+    The moves of every node are searched in order (see `order_moves`): the
+    best move of the position in the table first, which at the root is the
+    best move of the previous iteration, then the killer moves of the ply,
+    then the others by their history score.
+
+    Parameters
+    ----------
+    table_size : int (optional)
+        The number of slots of the transposition table, see
+        `TranspositionTable`. The other parameters are those of
+        `IsolationPlayer`.
     """
 
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=10., table_size=2**16):
+        IsolationPlayer.__init__(self, search_depth, score_fn, timeout)
+        self.table = TranspositionTable(table_size)
+        self.killers = {}
+        self.history = {}
+
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
         result before the time limit expires.
@@ -417,6 +498,10 @@ class AlphaBetaPlayer(IsolationPlayer):
         """
         self.time_left = time_left
 
+        self.table.new_generation()
+        self.killers = {}
+        self.history = {}
+
         best_move = (-1, -1)
         max_depth = 100
         
@@ -496,36 +581,248 @@ class AlphaBetaPlayer(IsolationPlayer):
         legal_moves = game.get_legal_moves()
         if not legal_moves:
             return ((-1, -1), self.score(game, self))
-        
+
+        key = self.table_key(game)
+        entry = self.table.lookup(key)
+        table_move = None
+        if entry is not None:
+            _, entry_depth, score, flag, table_move, _ = entry
+            if entry_depth >= depth and (flag == EXACT or (flag == LOWER and score >= beta) or
+                                         (flag == UPPER and score <= alpha)):
+                return (table_move, score)
+        legal_moves = self.order_moves(game, legal_moves, table_move, maximizing)
+
+        alpha_orig, beta_orig = alpha, beta
         best_move = (-1, -1)
  
         if maximizing:
             best_score = float("-inf")
 
             for move in legal_moves:
-                next_state = game.forecast_move(move)
-                _, score = self.ab(next_state, depth-1, alpha, beta, False)
+                game.push_move(move)
+                try:
+                    _, score = self.ab(game, depth-1, alpha, beta, False)
+                finally:
+                    game.pop_move()
                 
                 if score > best_score:
                     best_move, best_score = move, score
 
                 if best_score >= beta:
-                    return (best_move, best_score)
+                    self.record_cutoff(game, move, depth, maximizing)
+                    break
                 else:
                     alpha = max(alpha, best_score)
         else:
             best_score = float("inf")
 
             for move in legal_moves:
-                next_state = game.forecast_move(move)
-                _, score = self.ab(next_state, depth-1, alpha, beta, True)
+                game.push_move(move)
+                try:
+                    _, score = self.ab(game, depth-1, alpha, beta, True)
+                finally:
+                    game.pop_move()
                 
                 if score < best_score:
                     best_move, best_score = move, score
                 
                 if best_score <= alpha:
-                    return (best_move, best_score)
+                    self.record_cutoff(game, move, depth, maximizing)
+                    break
                 else:
                     beta = min(beta, best_score)
-                
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, depth, best_score, flag, best_move)
         return (best_move, best_score)
+
+    def table_key(self, game):
+        """Return the transposition table key of a position: its hash, made
+        different for the two sides the agent can play"""
+        if game._player_2 is self:
+            return game.hash() ^ PLAYER_2_KEY
+        return game.hash()
+
+    def order_moves(self, game, legal_moves, table_move, maximizing):
+        """Return the legal moves in the order to search them: `table_move`
+        (the best move stored for the position), the killer moves of the ply,
+        then the rest by decreasing history score
+        """
+        first = []
+        for move in (table_move,) + tuple(self.killers.get(game.move_count, ())):
+            if move in legal_moves and move not in first:
+                first.append(move)
+        history = self.history
+        rest = sorted((move for move in legal_moves if move not in first),
+                      key=lambda move: history.get((maximizing, move), 0), reverse=True)
+        return first + rest
+
+    def record_cutoff(self, game, move, depth, maximizing):
+        """Remember a move that cut off the search: as a killer of the ply
+        (`game.move_count`, at most two per ply), and in the history score of
+        the move for the side to move, weighted by the depth searched below it
+        """
+        killers = self.killers.setdefault(game.move_count, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        key = (maximizing, move)
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+
+# Stands in for the opponent on the boards sent to the worker processes
+OPPONENT = "opponent"
+
+
+def detach(game, player):
+    """Return a copy of `game` with the opponent of `player` replaced by
+    `OPPONENT`, so that the board can be pickled whatever the opponent is
+    """
+    board = game.copy()
+    opponent = game.get_opponent(player)
+    for name in ("_player_1", "_player_2", "_active_player", "_inactive_player"):
+        if getattr(board, name) is opponent:
+            setattr(board, name, OPPONENT)
+    return board
+
+
+def search_root_moves(args):
+    """Worker entry point: iterative deepening below a share of the root moves
+
+    Every depth is searched below each of the moves in turn, and only the
+    depths completed for all of them are kept.
+
+    Returns
+    -------
+    dict
+        The score of every move at each depth searched in time, as
+        {move: list<float>}: the score at index d looks d plies beyond the
+        move. The scores of a move stop once it is won or lost.
+    """
+    player, game, moves, deadline = args
+    player.time_left = lambda: 1000 * (deadline - timeit.default_timer())
+    decided = (float("inf"), float("-inf"))
+    results = dict((move, []) for move in moves)
+    for depth in range(100):
+        open_moves = [move for move in moves if not results[move] or results[move][-1] not in decided]
+        if not open_moves:
+            break
+        scores = []
+        try:
+            for move in open_moves:
+                game.push_move(move)
+                try:
+                    scores.append(player.ab(game, depth, float("-inf"), float("inf"), False)[1])
+                finally:
+                    game.pop_move()
+        except SearchTimeout:
+            break
+        for move, score in zip(open_moves, scores):
+            results[move].append(score)
+    return results
+
+
+class ParallelAlphaBetaPlayer(AlphaBetaPlayer):
+    """Alpha-beta agent that splits the root moves across worker processes.
+
+    The root moves are dealt out to the workers of a process pool, one
+    share per worker, and every worker searches its share with iterative
+    deepening and its own transposition table against a deadline derived
+    from `time_left`: the workers stop TIMER_THRESHOLD milliseconds before
+    this process must, which leaves that time to collect their results. The
+    move with the best score at the deepest depth that every move reached
+    (or was decided at) is played.
+
+    The root moves are not pruned against each other, so this only pays off
+    with several idle cores. The pool is started with the player, outside the
+    time of any move; stop it with `close` or by using the player as a
+    context manager (it is also stopped when the player is collected).
+
+    Parameters
+    ----------
+    processes : int (optional)
+        The number of worker processes (all cores when None). The other
+        parameters are those of `AlphaBetaPlayer`.
+    """
+
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=10., table_size=2**16,
+                 processes=None):
+        AlphaBetaPlayer.__init__(self, search_depth, score_fn, timeout, table_size)
+        self.processes = processes or cpu_count()
+        self._pool = Pool(self.processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def __getstate__(self):
+        # Only the search settings travel to the workers
+        state = dict(self.__dict__)
+        for name in ("_pool", "time_left", "table", "killers", "history"):
+            del state[name]
+        state["table_size"] = self.table.size
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        self.table = TranspositionTable(state.pop("table_size"))
+        self.__dict__.update(state)
+        self._pool = None
+        self.time_left = None
+        self.killers = {}
+        self.history = {}
+
+    def close(self):
+        """Stop the worker processes"""
+        if getattr(self, "_pool", None) is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def get_move(self, game, time_left):
+        """Search the root moves in parallel and return the best one before
+        the time limit expires (see `AlphaBetaPlayer.get_move`).
+        """
+        self.time_left = time_left
+        legal_moves = game.get_legal_moves()
+        if not legal_moves:
+            return (-1, -1)
+        if len(legal_moves) == 1:
+            return legal_moves[0]
+
+        if self._pool is None:
+            self._pool = Pool(self.processes)
+
+        deadline = timeit.default_timer() + (time_left() - self.TIMER_THRESHOLD) / 1000.
+        board = detach(game, self)
+        # One task per worker, so that no task waits for a free worker
+        # while the clock runs (or is left queued for the next move)
+        shares = min(self.processes, len(legal_moves))
+        tasks = [(self, board, legal_moves[i::shares], deadline) for i in range(shares)]
+
+        results = {}
+        iterator = self._pool.imap_unordered(search_root_moves, tasks)
+        try:
+            for _ in tasks:
+                wait = (time_left() - self.TIMER_THRESHOLD) / 1000.
+                for move, scores in iterator.next(max(wait, 0)).items():
+                    if scores:
+                        results[move] = scores
+        except TimeoutError:
+            pass
+        if not results:
+            return legal_moves[0]
+
+        decided = (float("inf"), float("-inf"))
+        open_depths = [len(scores) for scores in results.values() if scores[-1] not in decided]
+        depth = min(open_depths) if open_depths else max(len(scores) for scores in results.values())
+        return max(results, key=lambda move: results[move][min(depth, len(results[move])) - 1])
@@ -0,0 +1,263 @@
+"""
+This file contains the `BitBoard` class, a drop-in replacement for
+`isolation.Board` that stores the game state in integers instead of a list.
+
+The blocked cells are the set bits of a single integer, using the same cell
+index as `Board` (row + column * height), and the knight moves of every cell
+are precomputed once per board size as a bit mask. The legal moves of a player
+are then the bits of `moves[location] & ~blocked`, which avoids building and
+bounds-checking the 8 knight offsets on every call.
+
+As with `Board`, the legal moves are returned in random order, so that agents
+breaking ties by move order play the same on both boards.
+"""
+import random
+
+from .isolation import Board, zobrist_keys
+
+
+DIRECTIONS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+              (1, -2), (1, 2), (2, -1), (2, 1)]
+
+_tables = {}
+
+
+def move_tables(width, height):
+    """Return the (knight move masks, cell coordinates) of a board size, cached
+
+    The knight move mask of cell idx has the bit of every cell a knight can
+    jump to from idx set, and the coordinates are (row, column) by cell index.
+    """
+    key = (width, height)
+    if key not in _tables:
+        coords = tuple((idx % height, idx // height) for idx in range(width * height))
+        masks = []
+        for r, c in coords:
+            mask = 0
+            for dr, dc in DIRECTIONS:
+                if 0 <= r + dr < height and 0 <= c + dc < width:
+                    mask |= 1 << (r + dr + (c + dc) * height)
+            masks.append(mask)
+        _tables[key] = (tuple(masks), coords)
+    return _tables[key]
+
+
+class BitBoard(Board):
+    """Implement a model for the game Isolation assuming each player moves like
+    a knight in chess, with the board state kept in integers.
+
+    Parameters
+    ----------
+    player_1 : object
+        An object with a get_move() function. This is the only function
+        directly called by the Board class for each player.
+
+    player_2 : object
+        An object with a get_move() function. This is the only function
+        directly called by the Board class for each player.
+
+    width : int (optional)
+        The number of columns that the board should have.
+
+    height : int (optional)
+        The number of rows that the board should have.
+    """
+
+    def __init__(self, player_1, player_2, width=7, height=7):
+        self.width = width
+        self.height = height
+        self.move_count = 0
+        self._player_1 = player_1
+        self._player_2 = player_2
+        self._active_player = player_1
+        self._inactive_player = player_2
+
+        self._moves, self._coords = move_tables(width, height)
+        self._blocked = 0
+        # The cell index of each player (player 1 first), or NOT_MOVED
+        self._locations = [Board.NOT_MOVED, Board.NOT_MOVED]
+        self._undo_stack = []
+        self._zobrist = zobrist_keys(width, height)
+        self._hash = 0
+
+    @property
+    def _board_state(self):
+        """The state in the list layout of `Board`, for code that reads it"""
+        state = [(self._blocked >> idx) & 1 for idx in range(self.width * self.height)]
+        return state + [self.move_count & 1, self._locations[1], self._locations[0]]
+
+    def copy(self):
+        """ Return a deep copy of the current board. """
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.__dict__.update(self.__dict__)
+        new_board._locations = list(self._locations)
+        new_board._undo_stack = []
+        return new_board
+
+    def move_is_legal(self, move):
+        """Test whether a move is legal in the current game state.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+
+        Returns
+        -------
+        bool
+            Returns True if the move is legal, False otherwise
+        """
+        return (0 <= move[0] < self.height and 0 <= move[1] < self.width and
+                not (self._blocked >> (move[0] + move[1] * self.height)) & 1)
+
+    def get_blank_spaces(self):
+        """Return a list of the locations that are still available on the board.
+        """
+        blocked = self._blocked
+        return [coord for idx, coord in enumerate(self._coords) if not (blocked >> idx) & 1]
+
+    def _player_index(self, player):
+        if player == self._player_1:
+            return 0
+        if player == self._player_2:
+            return 1
+        raise RuntimeError("Invalid player in get_player_location: {}".format(player))
+
+    def get_player_location(self, player):
+        """Find the current location of the specified player on the board.
+
+        Parameters
+        ----------
+        player : object
+            An object registered as a player in the current game.
+
+        Returns
+        -------
+        (int, int) or None
+            The coordinate pair (row, column) of the input player, or None
+            if the player has not moved.
+        """
+        idx = self._locations[self._player_index(player)]
+        if idx is Board.NOT_MOVED:
+            return Board.NOT_MOVED
+        return self._coords[idx]
+
+    def _moves_mask(self, player):
+        """Return the open cells the player can move to as a bit mask"""
+        idx = self._locations[self._player_index(player)]
+        if idx is Board.NOT_MOVED:
+            return ((1 << (self.width * self.height)) - 1) & ~self._blocked
+        return self._moves[idx] & ~self._blocked
+
+    def get_legal_moves(self, player=None):
+        """Return the list of all legal moves for the specified player.
+
+        Parameters
+        ----------
+        player : object (optional)
+            An object registered as a player in the current game. If None,
+            return the legal moves for the active player on the board.
+
+        Returns
+        -------
+        list<(int, int)>
+            The list of coordinate pairs (row, column) of all legal moves
+            for the player constrained by the current game state.
+        """
+        if player is None:
+            player = self._active_player
+        mask = self._moves_mask(player)
+        coords = self._coords
+        moves = []
+        while mask:
+            bit = mask & -mask
+            moves.append(coords[bit.bit_length() - 1])
+            mask ^= bit
+        random.shuffle(moves)
+        return moves
+
+    def apply_move(self, move):
+        """Move the active player to a specified location.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+        """
+        idx = move[0] + move[1] * self.height
+        player = int(self._active_player == self._player_2)
+        cells, locations, side = self._zobrist
+        if self._locations[player] is not Board.NOT_MOVED:
+            self._hash ^= locations[player][self._locations[player]]
+        self._hash ^= cells[idx] ^ locations[player][idx] ^ side
+        self._locations[player] = idx
+        self._blocked |= 1 << idx
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count += 1
+
+    def push_move(self, move):
+        """Apply a move in place, keeping what is needed to take it back with
+        `pop_move` (see `Board.push_move`)."""
+        self._undo_stack.append((self._locations[int(self._active_player == self._player_2)], self._hash))
+        self.apply_move(move)
+
+    def pop_move(self):
+        """Take back the last move applied with `push_move`."""
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count -= 1
+        player = int(self._active_player == self._player_2)
+        self._blocked ^= 1 << self._locations[player]
+        self._locations[player], self._hash = self._undo_stack.pop()
+
+    def is_winner(self, player):
+        """ Test whether the specified player has won the game. """
+        return player == self._inactive_player and not self._moves_mask(self._active_player)
+
+    def is_loser(self, player):
+        """ Test whether the specified player has lost the game. """
+        return player == self._active_player and not self._moves_mask(self._active_player)
+
+    def utility(self, player):
+        """Returns the utility of the current game state from the perspective
+        of the specified player: +inf if the player has won, -inf if the player
+        has lost, and 0 otherwise (see `Board.utility`).
+        """
+        if not self._moves_mask(self._active_player):
+
+            if player == self._inactive_player:
+                return float("inf")
+
+            if player == self._active_player:
+                return float("-inf")
+
+        return 0.
+
+    def to_string(self, symbols=['1', '2']):
+        """Generate a string representation of the current game state, marking
+        the location of each player and indicating which cells have been
+        blocked, and which remain open.
+        """
+        p1_loc, p2_loc = self._locations
+
+        col_margin = len(str(self.height - 1)) + 1
+        prefix = "{:<" + "{}".format(col_margin) + "}"
+        offset = " " * (col_margin + 3)
+        out = offset + '   '.join(map(str, range(self.width))) + '\n\r'
+        for i in range(self.height):
+            out += prefix.format(i) + ' | '
+            for j in range(self.width):
+                idx = i + j * self.height
+                if not (self._blocked >> idx) & 1:
+                    out += ' '
+                elif p1_loc == idx:
+                    out += symbols[0]
+                elif p2_loc == idx:
+                    out += symbols[1]
+                else:
+                    out += '-'
+                out += ' | '
+            out += '\n\r'
+
+        return out
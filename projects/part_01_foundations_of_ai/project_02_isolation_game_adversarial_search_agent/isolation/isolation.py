@@ -13,6 +13,31 @@ from copy import copy
 
 TIME_LIMIT_MILLIS = 150
 
+_zobrist = {}
+
+
+def zobrist_keys(width, height):
+    """Return the random 64-bit keys of the Zobrist hash of a board size, cached
+
+    The hash of a position is the XOR of the key of every blocked cell, the
+    key of each player's location and, when player 2 has the initiative, the
+    side key, so applying a move only XORs a few keys into the hash.
+
+    Returns
+    -------
+    (list<int>, (list<int>, list<int>), int)
+        The blocked cell keys by cell index, the location keys of player 1 and
+        player 2 by cell index, and the side key
+    """
+    key = (width, height)
+    if key not in _zobrist:
+        rng = random.Random(width * 1000 + height)
+        size = width * height
+        cells = [rng.getrandbits(64) for _ in range(size)]
+        locations = tuple([rng.getrandbits(64) for _ in range(size)] for _ in range(2))
+        _zobrist[key] = (cells, locations, rng.getrandbits(64))
+    return _zobrist[key]
+
 
 class Board(object):
     """Implement a model for the game Isolation assuming each player moves like
@@ -52,8 +77,16 @@ class Board(object):
         self._board_state[-1] = Board.NOT_MOVED
         self._board_state[-2] = Board.NOT_MOVED
 
+        # The moves applied with push_move, with what pop_move needs to undo them
+        self._undo_stack = []
+
+        # The Zobrist hash of the position, updated by apply_move
+        self._zobrist = zobrist_keys(width, height)
+        self._hash = 0
+
     def hash(self):
-        return str(self._board_state).__hash__()
+        """Return the Zobrist hash of the current position (see `zobrist_keys`)"""
+        return self._hash
 
     @property
     def active_player(self):
@@ -97,6 +130,7 @@ class Board(object):
         new_board._active_player = self._active_player
         new_board._inactive_player = self._inactive_player
         new_board._board_state = copy(self._board_state)
+        new_board._hash = self._hash
         return new_board
 
     def forecast_move(self, move):
@@ -200,13 +234,42 @@ class Board(object):
             the active player on the board.
         """
         idx = move[0] + move[1] * self.height
-        last_move_idx = int(self.active_player == self._player_2) + 1
+        player = int(self.active_player == self._player_2)
+        last_move_idx = player + 1
+        cells, locations, side = self._zobrist
+        if self._board_state[-last_move_idx] is not Board.NOT_MOVED:
+            self._hash ^= locations[player][self._board_state[-last_move_idx]]
+        self._hash ^= cells[idx] ^ locations[player][idx] ^ side
         self._board_state[-last_move_idx] = idx
         self._board_state[idx] = 1
         self._board_state[-3] ^= 1
         self._active_player, self._inactive_player = self._inactive_player, self._active_player
         self.move_count += 1
 
+    def push_move(self, move):
+        """Apply a move in place, keeping what is needed to take it back with
+        `pop_move`. Searching one board with push_move / pop_move avoids the
+        board copy that `forecast_move` makes for every move.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+        """
+        last_move_idx = int(self.active_player == self._player_2) + 1
+        self._undo_stack.append((self._board_state[-last_move_idx], self._hash))
+        self.apply_move(move)
+
+    def pop_move(self):
+        """Take back the last move applied with `push_move`."""
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count -= 1
+        self._board_state[-3] ^= 1
+        last_move_idx = int(self.active_player == self._player_2) + 1
+        self._board_state[self._board_state[-last_move_idx]] = Board.BLANK
+        self._board_state[-last_move_idx], self._hash = self._undo_stack.pop()
+
     def is_winner(self, player):
         """ Test whether the specified player has won the game. """
         return player == self._inactive_player and not self.get_legal_moves(self._active_player)
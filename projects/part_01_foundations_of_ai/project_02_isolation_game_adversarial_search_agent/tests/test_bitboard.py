@@ -0,0 +1,66 @@
+"""Check that `BitBoard` plays exactly like the reference `Board`."""
+
+import random
+import unittest
+
+from isolation import Board, BitBoard
+
+
+class BitBoardTest(unittest.TestCase):
+
+    def assertSameState(self, board, bitboard):
+        for player in ("Player1", "Player2"):
+            self.assertEqual(sorted(board.get_legal_moves(player)), sorted(bitboard.get_legal_moves(player)))
+            self.assertEqual(board.get_player_location(player), bitboard.get_player_location(player))
+            self.assertEqual(board.utility(player), bitboard.utility(player))
+            self.assertEqual(board.is_winner(player), bitboard.is_winner(player))
+            self.assertEqual(board.is_loser(player), bitboard.is_loser(player))
+        self.assertEqual(board.get_blank_spaces(), bitboard.get_blank_spaces())
+        self.assertEqual(board.active_player, bitboard.active_player)
+        self.assertEqual(board.to_string(), bitboard.to_string())
+        self.assertEqual(board._board_state, bitboard._board_state)
+        self.assertEqual(board.hash(), bitboard.hash())
+
+    def test_random_games(self):
+        rng = random.Random(0)
+        for width, height in ((7, 7), (5, 8), (8, 5)):
+            for _ in range(20):
+                board = Board("Player1", "Player2", width, height)
+                bitboard = BitBoard("Player1", "Player2", width, height)
+                self.assertSameState(board, bitboard)
+                while board.get_legal_moves():
+                    move = rng.choice(board.get_legal_moves())
+                    self.assertEqual(board.move_is_legal(move), bitboard.move_is_legal(move))
+                    board.apply_move(move)
+                    bitboard = bitboard.forecast_move(move)
+                    self.assertSameState(board, bitboard)
+
+    def test_copy_is_independent(self):
+        bitboard = BitBoard("Player1", "Player2")
+        bitboard.apply_move((3, 3))
+        child = bitboard.forecast_move((0, 0))
+        self.assertEqual(bitboard.get_player_location("Player2"), None)
+        self.assertEqual(child.get_player_location("Player2"), (0, 0))
+        self.assertNotEqual(bitboard.hash(), child.hash())
+        self.assertFalse(child.move_is_legal((0, 0)))
+        self.assertTrue(bitboard.move_is_legal((0, 0)))
+
+    def test_transpositions_have_one_hash(self):
+        orders = ([(0, 0), (6, 6), (1, 2), (4, 5), (2, 4), (3, 3)],
+                  [(1, 2), (4, 5), (0, 0), (6, 6), (2, 4), (3, 3)],
+                  [(2, 4), (4, 5), (0, 0), (6, 6), (1, 2), (3, 3)])
+        for board_class in (Board, BitBoard):
+            boards = []
+            for moves in orders:
+                board = board_class("Player1", "Player2")
+                for move in moves:
+                    board.apply_move(move)
+                boards.append(board)
+            self.assertEqual(boards[0]._board_state, boards[1]._board_state)
+            self.assertEqual(boards[0].hash(), boards[1].hash())
+            self.assertNotEqual(boards[0].hash(), boards[2].hash())
+            self.assertNotEqual(boards[0].hash(), boards[0].forecast_move((5, 4)).hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Check the move ordering of the alpha-beta agent."""
+
+import unittest
+
+import game_agent
+
+from isolation import BitBoard
+
+
+class MoveOrderingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.player = game_agent.AlphaBetaPlayer()
+        self.board = BitBoard(self.player, game_agent.AlphaBetaPlayer())
+        self.board.apply_move((3, 3))
+        self.board.apply_move((0, 0))
+        self.moves = self.board.get_legal_moves()
+
+    def test_history_order(self):
+        self.player.history[(True, self.moves[-1])] = 5
+        self.player.history[(True, self.moves[-2])] = 3
+        self.player.history[(False, self.moves[-3])] = 9
+        ordered = self.player.order_moves(self.board, self.moves, None, True)
+        self.assertEqual(sorted(ordered), sorted(self.moves))
+        self.assertEqual(ordered[:2], [self.moves[-1], self.moves[-2]])
+
+    def test_table_move_then_killers(self):
+        self.player.record_cutoff(self.board, self.moves[1], 2, True)
+        self.player.record_cutoff(self.board, self.moves[2], 3, True)
+        self.player.record_cutoff(self.board, self.moves[3], 1, True)
+        self.assertEqual(self.player.killers[self.board.move_count], [self.moves[3], self.moves[2]])
+        self.assertEqual(self.player.history[(True, self.moves[2])], 9)
+
+        ordered = self.player.order_moves(self.board, self.moves, self.moves[2], True)
+        self.assertEqual(ordered[:3], [self.moves[2], self.moves[3], self.moves[1]])
+
+        # Moves that are not legal here are skipped
+        ordered = self.player.order_moves(self.board, self.moves, (6, 6), True)
+        self.assertEqual(ordered[:2], [self.moves[3], self.moves[2]])
+        self.assertEqual(len(ordered), len(self.moves))
+
+    def test_get_move(self):
+        calls = [0]
+
+        def time_left():
+            calls[0] += 1
+            return 1000 if calls[0] < 2000 else 0
+
+        self.assertIn(self.player.get_move(self.board, time_left), self.moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Check the root-split parallel alpha-beta agent."""
+
+import pickle
+import timeit
+import unittest
+
+import game_agent
+
+from isolation import Board, BitBoard
+
+
+class ParallelAlphaBetaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.player = game_agent.ParallelAlphaBetaPlayer(processes=2, table_size=1024)
+        self.opponent = game_agent.AlphaBetaPlayer()
+        self.opponent.time_left = lambda: 1000
+
+    def tearDown(self):
+        self.player.close()
+
+    def test_pickle(self):
+        self.player.time_left = lambda: 1000
+        self.player.table.store(1, 1, 0., game_agent.EXACT, (0, 0))
+        board = game_agent.detach(BitBoard(self.player, self.opponent), self.player)
+        player, board = pickle.loads(pickle.dumps((self.player, board)))
+        self.assertIs(board.active_player, player)
+        self.assertEqual(board.inactive_player, game_agent.OPPONENT)
+        self.assertEqual(player.table.size, 1024)
+        self.assertIsNone(player.table.lookup(1))
+        self.assertEqual(player.TIMER_THRESHOLD, self.player.TIMER_THRESHOLD)
+
+    def test_search_root_moves(self):
+        board = Board(self.player, self.opponent)
+        board.apply_move((3, 3))
+        board.apply_move((0, 0))
+        root_moves = board.get_legal_moves()
+        before = board.to_string()
+        deadline = timeit.default_timer() + 0.1
+        results = game_agent.search_root_moves((self.player, board, root_moves, deadline))
+        self.assertEqual(sorted(results), sorted(root_moves))
+        self.assertEqual(len(set(len(scores) for scores in results.values())), 1)
+        self.assertGreater(len(results[root_moves[0]]), 1)
+        self.assertEqual(board.to_string(), before)
+
+    def test_opening_in_time(self):
+        # More root moves than processes
+        for board_class in (Board, BitBoard):
+            board = board_class(self.player, self.opponent)
+            start = timeit.default_timer()
+            time_left = lambda: 150 - 1000 * (timeit.default_timer() - start)
+            move = self.player.get_move(board, time_left)
+            self.assertIn(move, board.get_legal_moves())
+            self.assertGreater(time_left(), 0)
+
+    def test_get_move_in_time(self):
+        for board_class in (Board, BitBoard):
+            board = board_class(self.player, self.opponent)
+            board.apply_move((3, 3))
+            board.apply_move((0, 0))
+            start = timeit.default_timer()
+            time_left = lambda: 150 - 1000 * (timeit.default_timer() - start)
+            move = self.player.get_move(board, time_left)
+            self.assertIn(move, board.get_legal_moves())
+            self.assertGreater(time_left(), 0)
+
+    def test_context_manager(self):
+        with game_agent.ParallelAlphaBetaPlayer(processes=1) as player:
+            self.assertIsNotNone(player._pool)
+        self.assertIsNone(player._pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Check that `push_move` / `pop_move` take a board back to the same state."""
+
+import random
+import unittest
+
+import game_agent
+
+from isolation import Board, BitBoard
+
+
+def snapshot(board):
+    return (list(board._board_state), board.move_count, board.active_player,
+            board.inactive_player, board.hash())
+
+
+class PushMoveTest(unittest.TestCase):
+
+    def play_and_undo(self, board_class):
+        rng = random.Random(1)
+        for width, height in ((7, 7), (5, 8)):
+            for _ in range(10):
+                board = board_class("Player1", "Player2", width, height)
+                snapshots = []
+                while board.get_legal_moves():
+                    move = rng.choice(sorted(board.get_legal_moves()))
+                    expected = board.forecast_move(move)
+                    snapshots.append(snapshot(board))
+                    board.push_move(move)
+                    self.assertEqual(snapshot(board), snapshot(expected))
+                while snapshots:
+                    board.pop_move()
+                    self.assertEqual(snapshot(board), snapshots.pop())
+
+    def test_board(self):
+        self.play_and_undo(Board)
+
+    def test_bitboard(self):
+        self.play_and_undo(BitBoard)
+
+
+class SearchMutatesOneBoardTest(unittest.TestCase):
+
+    def test_board_restored_after_timeout(self):
+        for board_class in (Board, BitBoard):
+            player1 = game_agent.AlphaBetaPlayer()
+            player2 = game_agent.AlphaBetaPlayer()
+            board = board_class(player1, player2)
+            board.apply_move((3, 3))
+            board.apply_move((2, 4))
+            before = snapshot(board)
+
+            calls = [0]
+
+            def time_left():
+                calls[0] += 1
+                return 1000 if calls[0] < 500 else 0
+
+            move = player1.get_move(board, time_left)
+            self.assertIn(move, board.get_legal_moves())
+            self.assertEqual(snapshot(board), before)
+
+    def test_same_score_on_both_boards(self):
+        for depth in (1, 2, 3):
+            scores = []
+            for board_class in (Board, BitBoard):
+                player1 = game_agent.MinimaxPlayer(search_depth=depth)
+                player2 = game_agent.MinimaxPlayer(search_depth=depth)
+                board = board_class(player1, player2)
+                board.apply_move((3, 3))
+                board.apply_move((0, 5))
+                player1.time_left = lambda: 1000
+                scores.append(player1.mm(board, depth)[1])
+            self.assertEqual(scores[0], scores[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Check the transposition table and that the alpha-beta search using it
+returns the minimax value."""
+
+import random
+import unittest
+
+import game_agent
+
+from game_agent import TranspositionTable, EXACT, LOWER, UPPER
+from isolation import BitBoard
+
+
+class TranspositionTableTest(unittest.TestCase):
+
+    def test_lookup(self):
+        table = TranspositionTable(8)
+        table.store(3, 2, 1.5, EXACT, (0, 1))
+        self.assertEqual(table.lookup(3)[:5], (3, 2, 1.5, EXACT, (0, 1)))
+        self.assertIsNone(table.lookup(11))
+        self.assertIsNone(table.lookup(4))
+
+    def test_depth_preferred_replacement(self):
+        table = TranspositionTable(8)
+        table.store(3, 4, 1., LOWER, (0, 1))
+        table.store(11, 2, 2., UPPER, (1, 0))
+        self.assertEqual(table.lookup(3)[1], 4)
+        self.assertIsNone(table.lookup(11))
+        table.store(11, 5, 2., UPPER, (1, 0))
+        self.assertIsNone(table.lookup(3))
+        self.assertEqual(table.lookup(11)[1], 5)
+
+        # Entries of an earlier turn are replaced by any search
+        table.new_generation()
+        table.store(3, 1, 0., EXACT, (2, 2))
+        self.assertEqual(table.lookup(3)[1], 1)
+        self.assertIsNone(table.lookup(11))
+
+
+class AlphaBetaTableTest(unittest.TestCase):
+
+    def test_minimax_value(self):
+        rng = random.Random(3)
+        for _ in range(10):
+            player1 = game_agent.MinimaxPlayer()
+            player2 = game_agent.MinimaxPlayer()
+            board = BitBoard(player1, player2)
+            # BitBoard shuffles the legal moves, sort them to replay the same games
+            for _ in range(rng.choice((2, 4, 6, 8))):
+                moves = sorted(board.get_legal_moves())
+                if not moves:
+                    break
+                board.apply_move(rng.choice(moves))
+            if not board.get_legal_moves():
+                continue
+
+            alphabeta = game_agent.AlphaBetaPlayer()
+            player1.time_left = alphabeta.time_left = lambda: 1000
+            board_ab = board.copy()
+            board_ab._player_1 = board_ab._active_player = alphabeta
+
+            # Iterative deepening over one table, as in get_move
+            alphabeta.table.new_generation()
+            for depth in range(1, 5):
+                expected = player1.mm(board, depth)[1]
+                self.assertEqual(alphabeta.ab(board_ab, depth, float("-inf"), float("inf"))[1], expected)
+
+    def test_same_opening_as_both_players(self):
+        rng = random.Random(7)
+        for _ in range(5):
+            agent = game_agent.AlphaBetaPlayer()
+            other = game_agent.AlphaBetaPlayer()
+            opening = BitBoard(other, agent)
+            opening.apply_move(rng.choice(sorted(opening.get_legal_moves())))
+            opening.apply_move(rng.choice(sorted(opening.get_legal_moves())))
+            moves = sorted(opening.get_legal_moves())
+            if not moves:
+                continue
+
+            # As player 2, as in the first game of a tournament match...
+            first = BitBoard(other, agent)
+            first.apply_move(opening.get_player_location(other))
+            first.apply_move(opening.get_player_location(agent))
+            first.apply_move(rng.choice(moves))
+            calls = [0]
+
+            def time_left():
+                calls[0] += 1
+                return 1000 if calls[0] < 5000 else 0
+
+            agent.get_move(first, time_left)
+
+            # ...then as player 1 from the same opening
+            second = BitBoard(agent, other)
+            second.apply_move(opening.get_player_location(other))
+            second.apply_move(opening.get_player_location(agent))
+            fresh = game_agent.AlphaBetaPlayer()
+            fresh_board = BitBoard(fresh, other)
+            fresh_board.apply_move(opening.get_player_location(other))
+            fresh_board.apply_move(opening.get_player_location(agent))
+
+            agent.time_left = fresh.time_left = lambda: 1000
+            agent.table.new_generation()
+            for depth in range(1, 4):
+                self.assertEqual(agent.ab(second, depth, float("-inf"), float("inf"))[1],
+                                 fresh.ab(fresh_board, depth, float("-inf"), float("inf"))[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
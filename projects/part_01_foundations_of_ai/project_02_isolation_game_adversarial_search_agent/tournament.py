@@ -17,7 +17,7 @@ import warnings
 
 from collections import namedtuple
 
-from isolation import Board
+from isolation import BitBoard
 from sample_players import (RandomPlayer, open_move_score,
                             improved_score, center_score)
 from game_agent import (MinimaxPlayer, AlphaBetaPlayer, custom_score,
@@ -48,8 +48,8 @@ def play_round(cpu_agent, test_agents, win_counts, num_matches):
     forfeit_count = 0
     for _ in range(num_matches):
 
-        games = sum([[Board(cpu_agent.player, agent.player),
-                      Board(agent.player, cpu_agent.player)]
+        games = sum([[BitBoard(cpu_agent.player, agent.player),
+                      BitBoard(agent.player, cpu_agent.player)]
                     for agent in test_agents], [])
 
         # initialize all games with a random move and response